@@ -0,0 +1,119 @@
+import json
+
+import click
+
+from api.database import get_db_connection
+from api.invalidation import notify_statement
+from api.user.onboarding import (
+    ROSTER_FORMATS,
+    RosterError,
+    import_roster,
+    roster_format,
+)
+
+# Groups locked and recounted per transaction
+RECONCILE_BATCH_SIZE = 1000
+
+# Recounts one batch of (already locked) groups and fixes the ones that
+# drifted. allow-seqscan: a full recount reads every membership of the batch.
+RECONCILE_MEMBER_COUNTS_SQL = """
+    -- allow-seqscan
+    WITH actual AS (
+        SELECT ig.id, count(gm.group_id) AS member_count
+        FROM interest_groups ig
+        LEFT JOIN group_memberships gm ON gm.group_id = ig.id
+        WHERE ig.id = ANY(%s)
+        GROUP BY ig.id
+    ),
+    fixed AS (
+        UPDATE interest_groups ig
+        SET member_count = actual.member_count
+        FROM actual
+        WHERE ig.id = actual.id
+          AND ig.member_count <> actual.member_count
+        RETURNING ig.id
+    ),
+    bumped AS (
+        INSERT INTO cache_versions (key, version)
+        SELECT 'group:' || id, 1 FROM fixed
+        ON CONFLICT (key) DO UPDATE SET version = cache_versions.version + 1
+    )
+    SELECT id FROM fixed
+"""
+
+
+def reconcile_member_counts(batch_size=RECONCILE_BATCH_SIZE):
+    # Sets interest_groups.member_count to the real number of memberships and
+    # returns how many groups were off. Each batch of groups is locked before
+    # it is counted: writes that change memberships update the count under the
+    # same row lock, so one still in flight either finished before the count
+    # (and is included) or applies its change after it.
+    fixed = 0
+    last_id = None
+    while True:
+        with get_db_connection() as conn:
+            if last_id is None:
+                rows = conn.execute(
+                    "SELECT id FROM interest_groups ORDER BY id LIMIT %s FOR UPDATE",
+                    (batch_size,),
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    """
+                    SELECT id FROM interest_groups
+                    WHERE id > %s
+                    ORDER BY id
+                    LIMIT %s
+                    FOR UPDATE
+                    """,
+                    (last_id, batch_size),
+                ).fetchall()
+            if not rows:
+                return fixed
+            group_ids = [row[0] for row in rows]
+            drifted = conn.execute(RECONCILE_MEMBER_COUNTS_SQL, (group_ids,)).fetchall()
+            if drifted:
+                conn.execute(
+                    *notify_statement(
+                        *[("member_count", str(row[0])) for row in drifted]
+                    )
+                )
+            conn.commit()
+        fixed += len(drifted)
+        last_id = group_ids[-1]
+
+
+@click.command("reconcile-member-counts")
+@click.option("--batch-size", default=RECONCILE_BATCH_SIZE, show_default=True)
+def reconcile_member_counts_command(batch_size):
+    """Recount interest group members and fix drifted member_count values."""
+    fixed = reconcile_member_counts(batch_size)
+    click.echo(f"Fixed member_count on {fixed} group(s)")
+
+
+@click.command("import-users")
+@click.argument("roster", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(ROSTER_FORMATS),
+    help="Defaults to the file extension.",
+)
+def import_users_command(roster, fmt):
+    """Onboard every user in a CSV or NDJSON roster file."""
+    fmt = fmt or roster_format(roster)
+    if fmt is None:
+        raise click.UsageError("Cannot tell the roster format; pass --format")
+    with open(roster, encoding="utf-8-sig", newline="") as lines:
+        with get_db_connection() as conn:
+            try:
+                counts = import_roster(conn, lines, fmt)
+            except RosterError as e:
+                raise click.ClickException(str(e))
+            conn.commit()
+    click.echo(json.dumps(counts, indent=2))
+
+
+def register_commands(app):
+    app.cli.add_command(reconcile_member_counts_command)
+    app.cli.add_command(import_users_command)
@@ -0,0 +1,124 @@
+import os
+import zlib
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional: only gzip is offered without it
+    brotli = None
+
+# Negotiated Content-Encoding for JSON and text responses. Bodies under
+# COMPRESS_MIN_SIZE bytes go out as they are: the framing costs more than it
+# saves. Streamed responses are compressed chunk by chunk and flushed after
+# each one, so rows still reach the client as they are read.
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "text/csv",
+    "text/html",
+    "text/plain",
+}
+
+# Preferred first when the client accepts both equally
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding():
+    accepted = request.accept_encodings
+    best = max(ENCODINGS, key=accepted.quality)
+    return best if accepted.quality(best) > 0 else None
+
+
+def compress(data, encoding):
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    # wbits=31 writes a gzip header without a timestamp, so equal bodies
+    # compress to equal bytes
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _compress_stream(chunks, encoding):
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        process, flush, finish = (
+            compressor.process,
+            compressor.flush,
+            compressor.finish,
+        )
+    else:
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+        process = compressor.compress
+        flush = lambda: compressor.flush(zlib.Z_SYNC_FLUSH)
+        finish = compressor.flush
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            data = process(chunk) + flush()
+            if data:
+                yield data
+        yield finish()
+    finally:
+        # Closing the wrapped iterable releases what it holds (e.g. a cursor)
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+def reuse_compressed(response, variants):
+    # variants is a dict kept with a cached body ({encoding: bytes}); each
+    # encoding is compressed on the first hit that asks for it and reused after
+    response.compressed_variants = variants
+    return response
+
+
+def _compress_response(response):
+    if response.status_code == 304:
+        # Same Vary as the 200 it stands in for
+        response.vary.add("Accept-Encoding")
+        return response
+    if (
+        response.mimetype not in COMPRESSIBLE_MIMETYPES
+        or response.status_code < 200
+        or response.status_code in (204, 206)
+        or response.direct_passthrough
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+    response.vary.add("Accept-Encoding")
+    encoding = negotiate_encoding()
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = _compress_stream(response.response, encoding)
+        response.headers.pop("Content-Length", None)
+    else:
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_SIZE:
+            return response
+        variants = getattr(response, "compressed_variants", None)
+        body = variants.get(encoding) if variants is not None else None
+        if body is None:
+            body = compress(data, encoding)
+            if variants is not None:
+                variants[encoding] = body
+        response.set_data(body)
+    response.headers["Content-Encoding"] = encoding
+
+    # Each encoding is a different representation, so it gets its own strong
+    # ETag; api.conditional.is_not_modified accepts these suffixed tags too
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f"{etag}-{encoding}", weak)
+    return response
+
+
+def init_app(app):
+    app.after_request(_compress_response)
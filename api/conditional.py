@@ -0,0 +1,75 @@
+import hashlib
+import os
+
+from flask import current_app, request
+
+from api.database import get_db
+
+# Sent with every cacheable read. max-age=0 makes browsers revalidate with
+# If-None-Match on each poll; s-maxage lets a CDN serve repeats on its own.
+READ_CACHE_CONTROL = os.getenv(
+    "READ_CACHE_CONTROL", "public, max-age=0, s-maxage=5, stale-while-revalidate=30"
+)
+
+# Version keys in the cache_versions table (see migrations/).
+# Write endpoints bump a key in the same transaction as the change it covers.
+CATALOG_KEY = "catalog"
+
+BUMP_VERSIONS_SQL = """
+    INSERT INTO cache_versions (key, version)
+    SELECT unnest(%s::text[]), 1
+    ON CONFLICT (key) DO UPDATE SET version = cache_versions.version + 1
+"""
+
+
+def group_key(group_id):
+    return f"group:{group_id}"
+
+
+def members_key(group_id):
+    return f"members:{group_id}"
+
+
+def bump_versions_statement(*keys):
+    # (sql, params) for batching the bump with other writes via execute_pipeline
+    return (BUMP_VERSIONS_SQL, (list(keys),))
+
+
+def version_etag(keys, *extra):
+    # Strong ETag for a response built from the data behind `keys`. The
+    # versions are read before the data itself, so an ETag is never newer than
+    # the body it is sent with.
+    with get_db().cursor() as cur:
+        cur.execute(
+            "SELECT key, version FROM cache_versions WHERE key = ANY(%s)",
+            (list(keys),),
+        )
+        versions = dict(cur.fetchall())
+    raw = "|".join(f"{key}={versions.get(key, 0)}" for key in keys)
+    raw += "|" + "|".join(str(value) for value in extra)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _matching_etag(etag):
+    # The tag the client holds: `etag` itself, or the same body compressed
+    # (api.compression appends the Content-Encoding, e.g. "<etag>-gzip").
+    # If-None-Match uses the weak comparison, so W/ tags match as well.
+    for tag in (etag, f"{etag}-br", f"{etag}-gzip"):
+        if request.if_none_match.contains_weak(tag):
+            return tag
+    return None
+
+
+def is_not_modified(etag):
+    return _matching_etag(etag) is not None
+
+
+def not_modified(etag, weak=False):
+    response = current_app.response_class(status=304)
+    return cacheable(response, _matching_etag(etag) or etag, weak)
+
+
+def cacheable(response, etag, weak=False):
+    response.set_etag(etag, weak)
+    response.headers["Cache-Control"] = READ_CACHE_CONTROL
+    return response
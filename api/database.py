@@ -1,6 +1,16 @@
+import atexit
 import os
+import threading
+import time
+from contextlib import contextmanager
+
 import psycopg
+from psycopg import pq
+from psycopg_pool import ConnectionPool
 from dotenv import load_dotenv
+from flask import g, jsonify
+
+from api import metrics, tracing
 
 # dot env
 load_dotenv()
@@ -12,11 +22,193 @@ if not DATABASE_URL:
         "DATABASE_URL environment variable not set. Please create a .env file."
     )
 
+# Pool settings (sizes are connections, times are seconds)
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+DB_POOL_MAX_LIFETIME = float(os.getenv("DB_POOL_MAX_LIFETIME", "1800"))
+DB_POOL_MAX_IDLE = float(os.getenv("DB_POOL_MAX_IDLE", "300"))
 
-def get_db_connection():
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    # The pool is opened on first use so importing the app never touches the
+    # database (and a serverless cold start only pays for what it uses).
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                pool = ConnectionPool(
+                    DATABASE_URL,
+                    min_size=DB_POOL_MIN_SIZE,
+                    max_size=max(DB_POOL_MAX_SIZE, DB_POOL_MIN_SIZE),
+                    timeout=DB_POOL_TIMEOUT,
+                    max_lifetime=DB_POOL_MAX_LIFETIME,
+                    max_idle=DB_POOL_MAX_IDLE,
+                    # Health check run on every checkout: a connection the
+                    # server (or a NAT) dropped while idle is replaced instead
+                    # of being handed to a request.
+                    check=ConnectionPool.check_connection,
+                    configure=_configure,
+                    name="seniorconnect",
+                    open=False,
+                )
+                pool.open()
+                _pool = pool
+    return _pool
+
+
+def _configure(conn):
+    # Queries on pooled connections are counted, timed and slow-logged
+    conn.cursor_factory = tracing.TracedCursor
+    conn.server_cursor_factory = tracing.TracedServerCursor
+
+
+def close_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+atexit.register(close_pool)
+
+
+def get_pool_stats():
+    if _pool is None:
+        return {}
+    return _pool.get_stats()
+
+
+def _pool_stat(name):
+    return lambda: get_pool_stats().get(name, 0)
+
+
+def _checkout():
+    start = time.perf_counter()
     try:
-        conn = psycopg.connect(DATABASE_URL)
-        return conn
-    except psycopg.Error as e:
+        conn = get_pool().getconn()
+    except psycopg.Error as e:  # PoolTimeout is an OperationalError
         print(f"Error connecting to database: {e}")
         raise
+    metrics.record_acquire(time.perf_counter() - start)
+    return conn
+
+
+def _release(conn):
+    # Anything not committed is rolled back here, so the next checkout always
+    # starts from a clean connection.
+    if conn.info.transaction_status != pq.TransactionStatus.IDLE:
+        try:
+            conn.rollback()
+        except psycopg.Error:
+            pass
+    get_pool().putconn(conn)
+
+
+@contextmanager
+def get_db_connection():
+    # For code running outside a request (scripts, CLI commands); the caller
+    # commits explicitly.
+    conn = _checkout()
+    try:
+        yield conn
+    finally:
+        _release(conn)
+
+
+def get_db():
+    # Request-scoped connection: checked out on first use and shared by every
+    # helper the request calls, so a request holds at most one connection and
+    # all of its statements run in one transaction.
+    if "db" not in g:
+        g.db = _checkout()
+    return g.db
+
+
+def execute_pipeline(statements, conn=None):
+    # Sends every (sql, params) pair in pipeline mode with a single sync point,
+    # so the whole batch costs one network round trip. Statements still run in
+    # order, so later ones can depend on the effects of earlier ones. Returns
+    # one cursor per statement, holding its results.
+    conn = conn or get_db()
+    cursors = []
+    start = time.perf_counter()
+    with conn.pipeline():
+        for sql, params in statements:
+            # Plain cursors: the batch is timed as a whole, since results only
+            # arrive at the sync point
+            cur = psycopg.Cursor(conn)
+            cur.execute(sql, params)
+            cursors.append(cur)
+    tracing.trace_pipeline(statements, time.perf_counter() - start)
+    return cursors
+
+
+def on_commit(callback):
+    # Runs callback after the current request's transaction commits, e.g. to
+    # update an in-process cache only with data that actually persisted.
+    g.setdefault("db_on_commit", []).append(callback)
+
+
+def _commit_db(response):
+    conn = g.get("db")
+    if conn is None or response.status_code >= 400:
+        return response
+    # Streamed bodies are still being read from the connection at this point;
+    # streaming endpoints only read, and the session is released once the
+    # stream ends.
+    if response.is_streamed:
+        return response
+    start = time.perf_counter()
+    try:
+        conn.commit()
+    except psycopg.Error as e:
+        print(f"Database error: {e}")
+        return _internal_error_response()
+    finally:
+        metrics.record_db_time(time.perf_counter() - start)
+    for callback in g.pop("db_on_commit", []):
+        callback()
+    return response
+
+
+def _release_db(exc):
+    # Whatever _commit_db did not commit (error responses, unhandled
+    # exceptions) is rolled back when the connection goes back to the pool.
+    conn = g.pop("db", None)
+    if conn is not None:
+        _release(conn)
+
+
+def _internal_error_response():
+    response = jsonify({"message": "An internal server error occurred"})
+    response.status_code = 500
+    return response
+
+
+def _handle_database_error(e):
+    print(f"Database error: {e}")
+    return _internal_error_response()
+
+
+def init_app(app):
+    metrics.register_gauge(
+        "db_pool_size", "Connections open in the pool.", _pool_stat("pool_size")
+    )
+    metrics.register_gauge(
+        "db_pool_available",
+        "Idle connections in the pool.",
+        _pool_stat("pool_available"),
+    )
+    metrics.register_gauge(
+        "db_pool_requests_waiting",
+        "Requests waiting for a connection.",
+        _pool_stat("requests_waiting"),
+    )
+    app.after_request(_commit_db)
+    app.teardown_appcontext(_release_db)
+    app.register_error_handler(psycopg.Error, _handle_database_error)
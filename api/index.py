@@ -1,4 +1,4 @@
-from flask import Flask, jsonify
+from flask import Flask, Response, jsonify
 from flask_cors import CORS
 from dotenv import load_dotenv
 import os
@@ -6,6 +6,10 @@ import psycopg
 
 # Importing blueprints
 from api.user import user_blueprints
+from api import compression, database, invalidation, metrics, tracing
+from api.commands import register_commands
+from api.cache import cache_stats
+from api.serialization import JSONProvider
 
 # dot env
 load_dotenv()
@@ -14,10 +18,33 @@ load_dotenv()
 # Initialise App
 app = Flask(__name__)
 
+# orjson-backed JSON (ISO 8601 datetimes, dataclass rows)
+app.json = JSONProvider(app)
+
 # CORS shenanagans
 allowed_origins = os.getenv("ALLOWED_ORIGINS", "").split(",")
 CORS(app, origins=allowed_origins)
 
+# gzip/brotli for JSON responses. after_request hooks run in reverse order of
+# registration, so registering first compresses the final response.
+compression.init_app(app)
+
+# Per-request latency / query metrics (before the database hooks, so the
+# final status and commit time are included)
+metrics.init_app(app)
+
+# Request-scoped database sessions
+database.init_app(app)
+
+# Slow-query log and per-route query budgets
+tracing.init_app(app)
+
+# Cross-instance cache invalidation (LISTEN/NOTIFY)
+invalidation.init_app(app)
+
+# CLI commands (flask --app api.index <command>)
+register_commands(app)
+
 # Registering blueprints
 app.register_blueprint(user_blueprints, url_prefix="/api/")
 
@@ -28,6 +55,18 @@ def home():
     return jsonify({"yes": "dis a response"})
 
 
+# Prometheus scrape endpoint (per process)
+@app.route("/metrics")
+def prometheus_metrics():
+    return Response(metrics.render_metrics(), mimetype="text/plain; version=0.0.4")
+
+
+# In-process cache hit/miss counters, for sizing the caches
+@app.route("/cache/stats")
+def caches():
+    return jsonify(cache_stats())
+
+
 # Uncomment this if you are deploying locally for testing
 """
 if __name__ == "__main__":
@@ -0,0 +1,95 @@
+import json
+import os
+import threading
+import time
+
+import psycopg
+
+from api.database import DATABASE_URL, on_commit
+
+# Cache invalidation events shared by every instance through Postgres
+# LISTEN/NOTIFY. A write publishes events in its own transaction, so they are
+# delivered only if (and when) it commits; each instance runs a listener thread
+# that applies them to its in-process caches.
+CHANNEL = "seniorconnect_invalidate"
+LISTENER_ENABLED = os.getenv("CACHE_INVALIDATION_LISTENER", "1") == "1"
+
+NOTIFY_SQL = "SELECT pg_notify(%s, payload) FROM unnest(%s::text[]) AS payload"
+
+# kind -> callbacks taking the event key; "reset" callbacks take no argument
+# and drop everything (used when events may have been missed)
+_handlers = {}
+_listener = None
+_listener_lock = threading.Lock()
+
+
+def register_handler(kind, callback):
+    _handlers.setdefault(kind, []).append(callback)
+
+
+def publish_statement(*events):
+    # Takes (kind, key) events and returns the (sql, params) that publishes
+    # them; add it to the request's writes (e.g. its execute_pipeline batch).
+    # This instance applies the events as soon as the transaction commits
+    # rather than waiting for its own notification.
+    for kind, key in events:
+        on_commit(lambda kind=kind, key=key: apply_event(kind, key))
+    return notify_statement(*events)
+
+
+def notify_statement(*events):
+    # Same, for code outside a request (CLI commands), which has no caches of
+    # its own to update
+    payloads = [json.dumps({"kind": kind, "key": key}) for kind, key in events]
+    return (NOTIFY_SQL, (CHANNEL, payloads))
+
+
+def apply_event(kind, key=None):
+    for callback in _handlers.get(kind, []):
+        if kind == "reset":
+            callback()
+        else:
+            callback(key)
+
+
+def _dispatch(payload):
+    try:
+        event = json.loads(payload)
+        apply_event(event["kind"], event.get("key"))
+    except (KeyError, TypeError, ValueError) as e:
+        print(f"Ignoring malformed invalidation event {payload!r}: {e}")
+
+
+def _listen_forever():
+    backoff = 1
+    while True:
+        try:
+            with psycopg.connect(DATABASE_URL, autocommit=True) as conn:
+                conn.execute(f"LISTEN {CHANNEL}")
+                # Anything published while we were not listening is lost
+                apply_event("reset")
+                backoff = 1
+                for notify in conn.notifies():
+                    _dispatch(notify.payload)
+        except psycopg.Error as e:
+            print(f"Invalidation listener error: {e}")
+        time.sleep(backoff)
+        backoff = min(backoff * 2, 30)
+
+
+def start_listener():
+    global _listener
+    if not LISTENER_ENABLED or _listener is not None:
+        return
+    with _listener_lock:
+        if _listener is None:
+            _listener = threading.Thread(
+                target=_listen_forever, name="cache-invalidation", daemon=True
+            )
+            _listener.start()
+
+
+def init_app(app):
+    # Started on the first request so importing the app (or a CLI command)
+    # does not open a connection
+    app.before_request(start_listener)
@@ -0,0 +1,193 @@
+import threading
+import time
+
+from flask import g, has_request_context, request
+
+# Per-endpoint request metrics in the Prometheus text format, kept in process
+# (each worker / serverless instance reports its own). The database layer
+# reports query counts, query time and connection checkout time through the
+# record_* helpers below (see api.tracing for the cursors).
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+_metrics = []
+_gauges = []
+
+
+class Counter:
+    def __init__(self, name, help, labelnames):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def inc(self, labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, labels)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help, labelnames, buckets):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # labels -> [per-bucket counts (+Inf last), sum]
+        self._values = {}
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def observe(self, labels, value):
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            counts = entry[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+            entry[1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, (counts, total) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + ("+Inf",), counts):
+                    cumulative += count
+                    bucket_labels = _labels(
+                        self.labelnames + ("le",), labels + (str(bound),)
+                    )
+                    lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+                label_text = _labels(self.labelnames, labels)
+                lines.append(f"{self.name}_sum{label_text} {total}")
+                lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def register_gauge(name, help, collect):
+    # collect() returns the current value, read when /metrics is scraped
+    _gauges.append((name, help, collect))
+
+
+def render_metrics():
+    lines = []
+    for metric in _metrics:
+        lines.extend(metric.render())
+    for name, help, collect in _gauges:
+        lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {collect()}")
+    return "\n".join(lines) + "\n"
+
+
+requests_total = Counter(
+    "http_requests_total", "Requests handled.", ("endpoint", "method", "status")
+)
+request_seconds = Histogram(
+    "http_request_duration_seconds",
+    "Request latency, including streaming the body.",
+    ("endpoint", "method"),
+    LATENCY_BUCKETS,
+)
+request_db_seconds = Histogram(
+    "http_request_db_seconds",
+    "Time per request spent executing queries and commits.",
+    ("endpoint",),
+    LATENCY_BUCKETS,
+)
+request_app_seconds = Histogram(
+    "http_request_app_seconds",
+    "Time per request spent outside the database (Python, serialization).",
+    ("endpoint",),
+    LATENCY_BUCKETS,
+)
+request_queries = Histogram(
+    "http_request_db_queries",
+    "Queries executed per request.",
+    ("endpoint",),
+    QUERY_COUNT_BUCKETS,
+)
+connection_acquire_seconds = Histogram(
+    "db_connection_acquire_seconds",
+    "Time to check a connection out of the pool.",
+    ("endpoint",),
+    LATENCY_BUCKETS,
+)
+
+
+def record_query(seconds, count=1):
+    if has_request_context():
+        g.metrics_queries = g.get("metrics_queries", 0) + count
+        g.metrics_db_seconds = g.get("metrics_db_seconds", 0.0) + seconds
+
+
+def record_db_time(seconds):
+    # Database time that is not a query of its own (e.g. COMMIT)
+    record_query(seconds, count=0)
+
+
+def record_acquire(seconds):
+    if has_request_context():
+        g.metrics_acquire_seconds = g.get("metrics_acquire_seconds", 0.0) + seconds
+
+
+def _start_request():
+    g.metrics_start = time.perf_counter()
+
+
+def _record_status(response):
+    g.metrics_status = response.status_code
+    return response
+
+
+def _finish_request(exc):
+    # Runs when the request context ends, i.e. after a streamed body is done
+    start = g.pop("metrics_start", None)
+    if start is None:
+        return
+    elapsed = time.perf_counter() - start
+    endpoint = request.endpoint or "unmatched"
+    status = g.pop("metrics_status", 500)
+    db_seconds = g.pop("metrics_db_seconds", 0.0)
+    acquire_seconds = g.pop("metrics_acquire_seconds", 0.0)
+
+    requests_total.inc((endpoint, request.method, str(status)))
+    request_seconds.observe((endpoint, request.method), elapsed)
+    request_db_seconds.observe((endpoint,), db_seconds)
+    request_app_seconds.observe(
+        (endpoint,), max(elapsed - db_seconds - acquire_seconds, 0.0)
+    )
+    request_queries.observe((endpoint,), g.pop("metrics_queries", 0))
+    if acquire_seconds:
+        connection_acquire_seconds.observe((endpoint,), acquire_seconds)
+
+
+def init_app(app):
+    # Registered before the database hooks so the latency covers them too
+    app.before_request(_start_request)
+    app.after_request(_record_status)
+    app.teardown_request(_finish_request)
@@ -0,0 +1,60 @@
+import dataclasses
+import datetime
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional: the standard library encoder is used instead
+    orjson = None
+
+# Flask's JSON provider, encoding with orjson when it is installed. Either way
+# UUIDs, dataclasses (the row types in api.user.records) and datetimes serialize
+# natively, datetimes as ISO 8601. Dict keys are sorted as Flask sorts them;
+# with orjson, dataclass rows keep their field order.
+
+
+def _default(o):
+    if isinstance(o, (datetime.date, datetime.time)):
+        return o.isoformat()
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return {field.name: getattr(o, field.name) for field in dataclasses.fields(o)}
+    return DefaultJSONProvider.default(o)
+
+
+class JSONProvider(DefaultJSONProvider):
+    default = staticmethod(_default)
+
+    def _pretty(self):
+        # Same rule as Flask's: indented in debug mode unless compact is set
+        return (self.compact is None and self._app.debug) or self.compact is False
+
+    def dumps_bytes(self, obj, indent=False):
+        if orjson is None:
+            if indent:
+                return self.dumps(obj, indent=2).encode()
+            return self.dumps(obj, separators=(",", ":")).encode()
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option)
+
+    def dumps(self, obj, **kwargs):
+        # orjson has no equivalent for most json.dumps arguments; the ones
+        # Flask itself passes are indent and separators
+        if orjson is None or set(kwargs) - {"indent", "separators"}:
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj, indent=bool(kwargs.get("indent"))).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Encoded straight to bytes, skipping the str round trip
+        obj = self._prepare_response_obj(args, kwargs)
+        body = self.dumps_bytes(obj, indent=self._pretty()) + b"\n"
+        return self._app.response_class(body, mimetype=self.mimetype)
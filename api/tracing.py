@@ -0,0 +1,170 @@
+import os
+import re
+import time
+
+import psycopg
+from flask import current_app, g, has_request_context, request
+
+from api import metrics
+
+# Query tracing for pooled connections (request sessions and
+# get_db_connection alike): statements slower than SLOW_QUERY_MS are logged
+# with normalized SQL and their parameters redacted, and every query is
+# counted towards the request's metrics and query budget. Budgets count round
+# trips, so a pipeline of statements counts once.
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+
+# Most round trips a route may make unless it declares its own @query_budget.
+# Budgets are checked when QUERY_BUDGETS=1 and always in debug / testing; a
+# request over budget is logged, and under TESTING fails with
+# QueryBudgetExceeded so an N+1 regression breaks the test suite.
+DEFAULT_QUERY_BUDGET = int(os.getenv("DEFAULT_QUERY_BUDGET", "5"))
+QUERY_BUDGETS_ENABLED = os.getenv("QUERY_BUDGETS", "0") == "1"
+
+_COMMENT = re.compile(r"--[^\n]*")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def query_budget(limit):
+    # Declares how many round trips a view may make per request; apply it below
+    # the route decorator
+    def decorator(view):
+        view.query_budget = limit
+        return view
+
+    return decorator
+
+
+def normalize_sql(query):
+    # One line, no comments, literals replaced with ?
+    query = _COMMENT.sub(" ", query)
+    query = _STRING.sub("?", query)
+    query = _NUMBER.sub("?", query)
+    return _WHITESPACE.sub(" ", query).strip()
+
+
+def redact_params(params):
+    # Parameter types only; values may be personal data (names, phones)
+    if params is None:
+        return "()"
+    if isinstance(params, dict):
+        return (
+            "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in params.items()) + "}"
+        )
+    return "(" + ", ".join(type(v).__name__ for v in params) + ")"
+
+
+def _query_text(cur, query):
+    if isinstance(query, str):
+        return query
+    if isinstance(query, bytes):
+        return query.decode()
+    return query.as_string(cur.connection)  # psycopg.sql.Composable
+
+
+def _where():
+    return f" [{request.method} {request.path}]" if has_request_context() else ""
+
+
+def _count_round_trip():
+    if has_request_context():
+        g.db_round_trips = g.get("db_round_trips", 0) + 1
+
+
+def _trace(cur, query, params, seconds):
+    _count_round_trip()
+    if seconds * 1000 >= SLOW_QUERY_MS:
+        print(
+            f"Slow query ({seconds * 1000:.1f} ms){_where()}: "
+            f"{normalize_sql(_query_text(cur, query))} params={redact_params(params)}"
+        )
+
+
+def trace_pipeline(statements, seconds):
+    # Pipelines are timed as a whole (results arrive together at the sync)
+    metrics.record_query(seconds, count=len(statements))
+    _count_round_trip()
+    if seconds * 1000 >= SLOW_QUERY_MS:
+        queries = " | ".join(normalize_sql(sql) for sql, _ in statements)
+        print(
+            f"Slow pipeline ({seconds * 1000:.1f} ms, {len(statements)} statements)"
+            f"{_where()}: {queries}"
+        )
+
+
+class TracedCursor(psycopg.Cursor):
+    # Results are fetched during execute, so its duration is the query's full
+    # database time
+
+    def execute(self, query, params=None, **kwargs):
+        if query == "":
+            # The pool's health check on checkout, not a request query
+            return super().execute(query, params, **kwargs)
+        start = time.perf_counter()
+        try:
+            return super().execute(query, params, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.record_query(elapsed)
+            _trace(self, query, params, elapsed)
+
+    def executemany(self, query, params_seq, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().executemany(query, params_seq, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.record_query(elapsed)
+            _trace(self, query, None, elapsed)
+
+
+class TracedServerCursor(psycopg.ServerCursor):
+    # Named cursors also spend database time in every fetch
+
+    def execute(self, query, params=None, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().execute(query, params, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.record_query(elapsed)
+            _trace(self, query, params, elapsed)
+
+    def fetchmany(self, size=0):
+        start = time.perf_counter()
+        try:
+            return super().fetchmany(size)
+        finally:
+            metrics.record_db_time(time.perf_counter() - start)
+
+
+def budget_for(endpoint):
+    view = current_app.view_functions.get(endpoint)
+    return getattr(view, "query_budget", DEFAULT_QUERY_BUDGET)
+
+
+def _check_budget(response):
+    app = current_app
+    if not (QUERY_BUDGETS_ENABLED or app.debug or app.testing):
+        return response
+    count = g.get("db_round_trips", 0)
+    if request.endpoint is None or count <= budget_for(request.endpoint):
+        return response
+    message = (
+        f"{request.endpoint} made {count} database round trips, "
+        f"over its budget of {budget_for(request.endpoint)}"
+    )
+    if app.testing:
+        raise QueryBudgetExceeded(message)
+    print(f"Query budget exceeded{_where()}: {message}")
+    return response
+
+
+def init_app(app):
+    app.after_request(_check_budget)
@@ -1,8 +1,16 @@
 from flask import Blueprint, jsonify, request
 from dotenv import load_dotenv
-from psycopg2 import pool
-import psycopg
-from api.database import get_db_connection
+import io
+from api.database import get_db
+from api.user.onboarding import RosterError, import_roster, roster_format
+from api.tracing import query_budget
+from api.user.identity import (
+    cache_user,
+    is_known_user,
+    remember_user,
+    resolve_user,
+    resolve_users,
+)
 import os
 
 
@@ -11,9 +19,32 @@ connection_string = os.getenv("DATABASE_URL")
 
 user_auth = Blueprint("user_auth", __name__)
 
+# Most ids accepted by the batch endpoints
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "500"))
+
+# Bytes read from a roster upload at a time
+ROSTER_READ_BUFFER = 64 * 1024
+
+# Onboards a user in one round trip, race-free: the row and whether this
+# statement created it. An existing user comes back from the SELECT arm.
+ONBOARD_SQL = """
+    WITH inserted AS (
+        INSERT INTO users (clerk_user_id, display_name, phone_number)
+        VALUES (%(clerk_user_id)s, %(display_name)s, %(phone_number)s)
+        ON CONFLICT (clerk_user_id) DO NOTHING
+        RETURNING id, role
+    )
+    SELECT id, role, true FROM inserted
+    UNION ALL
+    SELECT id, role, false FROM users
+    WHERE clerk_user_id = %(clerk_user_id)s
+      AND NOT EXISTS (SELECT 1 FROM inserted)
+"""
+
 
 @user_auth.route("/", methods=["POST"])
 @user_auth.route("", methods=["POST"])
+@query_budget(1)
 def authUser():
     try:
         data = request.get_json(force=False, silent=False)
@@ -38,48 +69,43 @@ def authUser():
     ):
         return jsonify({"error": "Invalid data type"}), 400
 
-    conn = None
-    cur = None
-
-    try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        check_sql = "SELECT * FROM users WHERE clerk_user_id = %s"
-        cur.execute(check_sql, (clerk_user_id,))
-        existing_user_row = cur.fetchone()
-        if existing_user_row:
-            return jsonify({"message": "User already exists"}), 200
-        else:
-            insert_sql = """
-            INSERT INTO users (clerk_user_id, display_name, phone_number)
-            VALUES (%s, %s, %s)
-            RETURNING id;
-            """
-            cur.execute(insert_sql, (clerk_user_id, display_name, phone_number))
-            new_id = cur.fetchone()[0]
-            conn.commit()
-            return (
-                jsonify(
-                    {
-                        "message": "User successfully onboarded",
-                        "user_id": new_id,
-                        "clerk_user_id": clerk_user_id,
-                    }
-                ),
-                201,
-            )
-    except psycopg.Error as e:
-        if conn:
-            conn.rollback()
-        return jsonify({"message": "An internal server error occurred"}), 500
-    finally:
-        if cur:
-            cur.close()
-        if conn:
-            conn.close()
+    # Repeat logins are answered without touching the database
+    if is_known_user(clerk_user_id):
+        return jsonify({"message": "User already exists"}), 200
+
+    with get_db().cursor() as cur:
+        cur.execute(
+            ONBOARD_SQL,
+            {
+                "clerk_user_id": clerk_user_id,
+                "display_name": display_name,
+                "phone_number": phone_number,
+            },
+        )
+        row = cur.fetchone()
+    if row is None:
+        # Created by a concurrent request that committed after this
+        # statement's snapshot was taken
+        return jsonify({"message": "User already exists"}), 200
+    user_id, role, created = row
+    if not created:
+        cache_user(clerk_user_id, user_id, role)
+        return jsonify({"message": "User already exists"}), 200
+    remember_user(clerk_user_id, user_id, role)
+    return (
+        jsonify(
+            {
+                "message": "User successfully onboarded",
+                "user_id": user_id,
+                "clerk_user_id": clerk_user_id,
+            }
+        ),
+        201,
+    )
 
 
 @user_auth.route("/isAdmin", methods=["POST"])
+@query_budget(1)
 def isAdmin():
     try:
         data = request.get_json(force=False, silent=False)
@@ -96,26 +122,69 @@ def isAdmin():
     if not isinstance(clerk_user_id, str):
         return jsonify({"error": "Invalid data type"}), 400
 
-    conn = None
-    cur = None
+    # Answered from the user cache; only a cache miss touches the database
+    user = resolve_user(clerk_user_id)
+    return jsonify({"is_admin": user is not None and user[1] == "Admin"}), 200
+
 
+@user_auth.route("/isAdmin/batch", methods=["POST"])
+@query_budget(1)
+def isAdminBatch():
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        check_sql = "SELECT role FROM users WHERE clerk_user_id = %s"
-        cur.execute(check_sql, (clerk_user_id,))
-        row = cur.fetchone()
-        if row:
-            is_admin = row[0] == "Admin"
-            return jsonify({"is_admin": is_admin}), 200
-        else:
-            return jsonify({"is_admin": False}), 200
-    except psycopg.Error as e:
-        if conn:
-            conn.rollback()
-        return jsonify({"message": "An internal server error occurred"}), 500
-    finally:
-        if cur:
-            cur.close()
-        if conn:
-            conn.close()
+        data = request.get_json(force=False, silent=False)
+    except Exception as e:
+        return jsonify({"error": "Invalid JSON", "details": str(e)}), 400
+
+    if not data:
+        return jsonify({"error": "No data provided"}), 400
+
+    clerk_user_ids = data.get("clerk_user_ids")
+
+    if not clerk_user_ids:
+        return jsonify({"error": "Missing required fields"}), 400
+    if not isinstance(clerk_user_ids, list) or not all(
+        isinstance(clerk_user_id, str) for clerk_user_id in clerk_user_ids
+    ):
+        return jsonify({"error": "Invalid data type"}), 400
+    if len(clerk_user_ids) > MAX_BATCH_SIZE:
+        return jsonify({"error": f"At most {MAX_BATCH_SIZE} ids per request"}), 400
+
+    users = resolve_users(clerk_user_ids)
+    is_admin = {
+        clerk_user_id: clerk_user_id in users and users[clerk_user_id][1] == "Admin"
+        for clerk_user_id in clerk_user_ids
+    }
+    return jsonify({"is_admin": is_admin}), 200
+
+
+@user_auth.route("/bulk", methods=["POST"])
+@query_budget(3)
+def bulk_onboard():
+    # A partner roster as the raw body (text/csv with a header row, or
+    # application/x-ndjson), loaded by a site admin given as ?clerk_user_id=
+    clerk_user_id = request.args.get("clerk_user_id")
+    if not clerk_user_id:
+        return jsonify({"error": "Missing required fields"}), 400
+    fmt = roster_format(request.mimetype)
+    if fmt is None:
+        return (
+            jsonify({"error": "Send the roster as text/csv or application/x-ndjson"}),
+            415,
+        )
+
+    user = resolve_user(clerk_user_id)
+    if user is None or user[1] != "Admin":
+        return jsonify({"error": "Not authorized"}), 403
+
+    # Streamed line by line from the request body into COPY (the raw stream
+    # reads a byte at a time when asked for lines, so buffer it)
+    lines = io.TextIOWrapper(
+        io.BufferedReader(request.stream, ROSTER_READ_BUFFER),
+        encoding="utf-8-sig",
+        newline="",
+    )
+    try:
+        counts = import_roster(get_db(), lines, fmt)
+    except (RosterError, UnicodeDecodeError) as e:
+        return jsonify({"error": "Invalid roster", "details": str(e)}), 400
+    return jsonify(counts), 200
@@ -0,0 +1,109 @@
+import os
+import threading
+import time
+
+from flask import current_app
+
+from api.cache import TTLCache
+from api.conditional import CATALOG_KEY, version_etag
+from api.invalidation import register_handler
+
+# Rendered /info/all pages and /info/<group_id> bodies, kept per process
+CATALOG_CACHE_SIZE = int(os.getenv("CATALOG_CACHE_SIZE", "2000"))
+CATALOG_CACHE_TTL = float(os.getenv("CATALOG_CACHE_TTL", "300"))
+
+
+class CatalogCache:
+    # Entries are (etag, body bytes, compressed variants), so a hit needs
+    # neither a query nor serialization, nor compression after the first hit
+    # per encoding (see api.compression.reuse_compressed). Pages are keyed by
+    # the catalog generation, which every catalog change bumps, and by the
+    # count window; group entries remember the group's generation.
+    #
+    # Joins and leaves only change member counts, so they invalidate the
+    # group's own entry and leave the pages alone: the counts on a page are at
+    # most one window (CATALOG_CACHE_TTL) old.
+    #
+    # Readers take a token *before* querying and store under it, so a result
+    # read just before a concurrent write commits can never be served after
+    # that write's invalidation.
+
+    def __init__(self, maxsize, ttl):
+        self.pages = TTLCache("catalog_pages", maxsize, ttl)
+        self.groups = TTLCache("group_info", maxsize, ttl)
+        self.generation = 0
+        self._group_generations = {}
+        self._lock = threading.Lock()
+
+    def page_token(self):
+        return (self.generation, count_window())
+
+    def get_page(self, key):
+        return self.pages.get((self.page_token(), key))
+
+    def put_page(self, token, key, etag, body):
+        variants = {}
+        self.pages.set((token, key), (etag, body, variants))
+        return variants
+
+    def group_token(self, group_id):
+        return self._group_generations.get(group_id, 0)
+
+    def get_group(self, group_id):
+        entry = self.groups.get(group_id)
+        if entry is None or entry[0] != self.group_token(group_id):
+            return None
+        return entry[1]
+
+    def put_group(self, token, group_id, etag, body):
+        variants = {}
+        self.groups.set(group_id, (token, (etag, body, variants)))
+        return variants
+
+    def invalidate_catalog(self):
+        with self._lock:
+            self.generation += 1
+
+    def invalidate_group(self, group_id):
+        # A group's details also appear in the catalog pages
+        with self._lock:
+            self._group_generations[group_id] = self.group_token(group_id) + 1
+            self.generation += 1
+        self.groups.pop(group_id)
+
+    def invalidate_member_count(self, group_id):
+        with self._lock:
+            self._group_generations[group_id] = self.group_token(group_id) + 1
+        self.groups.pop(group_id)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._group_generations.clear()
+        self.pages.clear()
+        self.groups.clear()
+
+
+def count_window():
+    # Same on every instance, so they agree on the page ETags
+    return int(time.time() // max(CATALOG_CACHE_TTL, 1))
+
+
+def catalog_etag(token):
+    # Weak: pages built in the same count window can differ in member counts,
+    # but everything else on them is covered by the catalog version
+    return version_etag([CATALOG_KEY], token[1])
+
+
+catalog_cache = CatalogCache(CATALOG_CACHE_SIZE, CATALOG_CACHE_TTL)
+
+# Write endpoints publish ("catalog", None), ("group", group_id) or, for
+# joins and leaves, ("member_count", group_id) events
+register_handler("catalog", lambda key: catalog_cache.invalidate_catalog())
+register_handler("group", catalog_cache.invalidate_group)
+register_handler("member_count", catalog_cache.invalidate_member_count)
+register_handler("reset", catalog_cache.clear)
+
+
+def cached_json_response(body):
+    return current_app.response_class(body, mimetype="application/json")
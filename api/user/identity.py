@@ -0,0 +1,106 @@
+import os
+
+from api.cache import TTLCache
+from api.database import get_db, on_commit
+from api.invalidation import register_handler
+
+# clerk_user_id -> (user uuid, role), shared by every blueprint
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))
+
+user_cache = TTLCache("users", USER_CACHE_SIZE, USER_CACHE_TTL)
+
+# clerk_user_ids known to have onboarded, so repeat logins skip the database.
+# Users are rarely deleted, so this outlives user_cache; deletes are published
+# by the trigger below, and the TTL bounds how long a missed event leaves a
+# removed user reported as existing. KNOWN_USERS_CACHE_SIZE=0 turns it off.
+KNOWN_USERS_CACHE_SIZE = int(os.getenv("KNOWN_USERS_CACHE_SIZE", "100000"))
+KNOWN_USERS_TTL = float(os.getenv("KNOWN_USERS_TTL", "86400"))
+
+known_users = TTLCache("known_users", KNOWN_USERS_CACHE_SIZE, KNOWN_USERS_TTL)
+
+# ("user", clerk_user_id) events are published on role changes and deletes,
+# including by the trigger on users created by the migrations
+
+
+def _forget_user(clerk_user_id):
+    user_cache.pop(clerk_user_id)
+    known_users.pop(clerk_user_id)
+
+
+register_handler("user", _forget_user)
+register_handler("reset", user_cache.clear)
+register_handler("reset", known_users.clear)
+
+
+def resolve_user(clerk_user_id):
+    # (uuid, role) for a clerk user, or None if they have not onboarded.
+    # Unknown users are not cached, so a user who onboards right after a
+    # failed lookup is found on the next request.
+    user = user_cache.get(clerk_user_id)
+    if user is not None:
+        return user
+
+    with get_db().cursor() as cur:
+        cur.execute(
+            "SELECT id, role FROM users WHERE clerk_user_id = %s", (clerk_user_id,)
+        )
+        row = cur.fetchone()
+    if not row:
+        return None
+    return cache_user(clerk_user_id, row[0], row[1])
+
+
+def resolve_users(clerk_user_ids):
+    # {clerk_user_id: (uuid, role)} for the ids that exist; everything not
+    # cached is fetched with a single query.
+    users = {}
+    missing = []
+    for clerk_user_id in set(clerk_user_ids):
+        user = user_cache.get(clerk_user_id)
+        if user is None:
+            missing.append(clerk_user_id)
+        else:
+            users[clerk_user_id] = user
+
+    if missing:
+        with get_db().cursor() as cur:
+            cur.execute(
+                "SELECT clerk_user_id, id, role FROM users WHERE clerk_user_id = ANY(%s)",
+                (missing,),
+            )
+            for clerk_user_id, user_id, role in cur.fetchall():
+                users[clerk_user_id] = cache_user(clerk_user_id, user_id, role)
+    return users
+
+
+def cached_user(clerk_user_id):
+    # Cache-only lookup, for handlers that batch the users query themselves
+    return user_cache.get(clerk_user_id)
+
+
+def is_known_user(clerk_user_id):
+    # True if the user has onboarded, answered from the caches only
+    return (
+        known_users.get(clerk_user_id) is not None
+        or user_cache.get(clerk_user_id) is not None
+    )
+
+
+def cache_user(clerk_user_id, user_id, role):
+    # Cache a user row read from the database
+    user = (user_id, role)
+    user_cache.set(clerk_user_id, user)
+    known_users.set(clerk_user_id, True)
+    return user
+
+
+def remember_user(clerk_user_id, user_id, role):
+    # Cache a user written by the current request once its transaction commits
+    on_commit(lambda: cache_user(clerk_user_id, user_id, role))
+
+
+def invalidate_user(clerk_user_id):
+    # Local-only eviction; writes that change a role should instead publish a
+    # ("user", clerk_user_id) event so every instance drops it
+    user_cache.pop(clerk_user_id)
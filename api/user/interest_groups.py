@@ -1,8 +1,39 @@
-from flask import Blueprint, abort, jsonify, request
+from flask import (
+    Blueprint,
+    Response,
+    current_app,
+    jsonify,
+    request,
+    stream_with_context,
+)
 from dotenv import load_dotenv
-from psycopg2 import pool
-import psycopg
-from api.database import get_db_connection
+from psycopg.rows import args_row
+import base64
+import json
+import uuid
+from api.conditional import (
+    CATALOG_KEY,
+    bump_versions_statement,
+    cacheable,
+    group_key,
+    is_not_modified,
+    members_key,
+    not_modified,
+    version_etag,
+)
+from api.compression import reuse_compressed
+from api.database import execute_pipeline, get_db
+from api.invalidation import publish_statement
+from api.tracing import query_budget
+from api.user.catalog_cache import cached_json_response, catalog_cache, catalog_etag
+from api.user.identity import cache_user, cached_user, resolve_user
+from api.user.records import (
+    Application,
+    ApplicationDetail,
+    GroupInfo,
+    Member,
+    ViewerGroupInfo,
+)
 import os
 
 load_dotenv()
@@ -10,83 +41,348 @@ connection_string = os.getenv("DATABASE_URL")
 
 interest_groups = Blueprint("interest_groups", __name__)
 
+# Page sizes for the paginated list endpoints
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "50"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "200"))
+# Rows fetched from the server per chunk when streaming
+STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", "500"))
+NDJSON_MIMETYPE = "application/x-ndjson"
+# Most ids accepted by the batch endpoints
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "500"))
+
+GROUP_INFO_SQL = """
+    SELECT ig.id, ig.name, ig.description, u.display_name AS creator_name,
+           ig.member_count
+    FROM interest_groups ig
+    JOIN users u ON ig.creator_id = u.id
+"""
+
+
+# GROUP_INFO_SQL plus is_member / is_creator for one viewer (a clerk user id;
+# both are false if the viewer does not exist)
+GROUP_INFO_FOR_VIEWER_SQL = """
+    SELECT ig.id, ig.name, ig.description, u.display_name AS creator_name,
+           ig.member_count,
+           EXISTS (
+               SELECT 1 FROM group_memberships gm
+               WHERE gm.group_id = ig.id AND gm.user_id = viewer.id
+           ) AS is_member,
+           ig.creator_id IS NOT DISTINCT FROM viewer.id AS is_creator
+    FROM interest_groups ig
+    JOIN users u ON ig.creator_id = u.id
+    LEFT JOIN users viewer ON viewer.clerk_user_id = %s
+"""
+
 
 @interest_groups.route("/info/all", methods=["GET"])
+@query_budget(2)
 def all_groups():
-    conn = None
-    cur = None
+    # Keyset pagination on (name, id): every page is an index range scan of
+    # at most `limit` rows, however large the catalog grows.
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
+        limit = int(request.args.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return jsonify({"error": "Invalid limit"}), 400
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        return jsonify({"error": f"limit must be between 1 and {MAX_PAGE_SIZE}"}), 400
+
+    conditions = []
+    params = []
+    cursor = request.args.get("cursor")
+    if cursor:
+        after = _decode_cursor(cursor)
+        if after is None:
+            return jsonify({"error": "Invalid cursor"}), 400
+        conditions.append("(ig.name, ig.id) > (%s, %s)")
+        params.extend(after)
+    # Optional filter: only groups created by this clerk user
+    creator = request.args.get("creator")
+    if creator:
+        conditions.append("u.clerk_user_id = %s")
+        params.append(creator)
+    where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    # Membership flags for this user. The page then depends on their
+    # memberships, which the catalog version does not cover, so it skips the
+    # page cache and ETag.
+    viewer = request.args.get("clerk_user_id")
+    if viewer:
+        with get_db().cursor(row_factory=args_row(ViewerGroupInfo)) as cur:
+            cur.execute(
+                f"""
+                {GROUP_INFO_FOR_VIEWER_SQL}
+                {where_clause}
+                ORDER BY ig.name, ig.id
+                LIMIT %s
+            """,
+                [viewer] + params + [limit + 1],
+            )
+            return jsonify(_group_page(cur.fetchall(), limit))
+
+    page_key = tuple(sorted(request.args.items(multi=True)))
+    cached = catalog_cache.get_page(page_key)
+    if cached is not None:
+        return _serve_cached(*cached, weak=True)
+
+    token = catalog_cache.page_token()
+    etag = catalog_etag(token)
+    if is_not_modified(etag):
+        return not_modified(etag, weak=True)
+
+    with get_db().cursor(row_factory=args_row(GroupInfo)) as cur:
         cur.execute(
-            """
-            SELECT ig.id, ig.name, ig.description, u.display_name AS creator_name
-            FROM interest_groups ig
-            JOIN users u ON ig.creator_id = u.id
-            ORDER BY ig.name
-        """
+            f"""
+            {GROUP_INFO_SQL}
+            {where_clause}
+            ORDER BY ig.name, ig.id
+            LIMIT %s
+        """,
+            params + [limit + 1],
         )
-        rows = cur.fetchall()
-        groups = [
+        response = jsonify(_group_page(cur.fetchall(), limit))
+        variants = catalog_cache.put_page(token, page_key, etag, response.get_data())
+        return cacheable(reuse_compressed(response, variants), etag, weak=True)
+
+
+def _group_page(rows, limit):
+    # rows holds up to limit + 1 rows; the extra one means there is a next page
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1].name, rows[-1].id)
+    return {"groups": rows, "next_cursor": next_cursor}
+
+
+def _serve_cached(etag, body, variants, weak=False):
+    if is_not_modified(etag):
+        return not_modified(etag, weak)
+    response = reuse_compressed(cached_json_response(body), variants)
+    return cacheable(response, etag, weak)
+
+
+def _encode_cursor(*values):
+    raw = json.dumps([str(v) if isinstance(v, uuid.UUID) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _cursor_values(cursor):
+    raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+    return json.loads(raw)
+
+
+def _decode_cursor(cursor):
+    try:
+        name, group_id = _cursor_values(cursor)
+    except (TypeError, ValueError):
+        return None
+    group_id = _parse_uuid(group_id)
+    if not isinstance(name, str) or group_id is None:
+        return None
+    return name, group_id
+
+
+# Ranked search: full text over name + description (interest_groups.search_vector,
+# GIN indexed), falling back to trigram similarity on names (pg_trgm) when
+# nothing matches, which catches typos and partial words. Both page by keyset
+# on (rank, id), best matches first; without a cursor, after_rank is NULL.
+# Only the final page is joined to users.
+SEARCH_MAX_QUERY_LENGTH = 200
+
+SEARCH_FULLTEXT_SQL = """
+    SELECT page.id, page.name, page.description, u.display_name AS creator_name,
+           page.member_count, page.rank
+    FROM (
+        SELECT ig.id, ig.name, ig.description, ig.creator_id, ig.member_count,
+               ts_rank(ig.search_vector, query) AS rank
+        FROM websearch_to_tsquery('english', %(query)s) AS query,
+             interest_groups ig
+        WHERE ig.search_vector @@ query
+          AND (
+              %(after_rank)s::real IS NULL
+              OR (ts_rank(ig.search_vector, query), ig.id)
+                 < (%(after_rank)s::real, %(after_id)s::uuid)
+          )
+        ORDER BY rank DESC, ig.id DESC
+        LIMIT %(limit)s
+    ) page
+    JOIN users u ON page.creator_id = u.id
+    ORDER BY page.rank DESC, page.id DESC
+"""
+
+SEARCH_FUZZY_SQL = """
+    -- requires-extension: pg_trgm
+    SELECT page.id, page.name, page.description, u.display_name AS creator_name,
+           page.member_count, page.rank
+    FROM (
+        SELECT ig.id, ig.name, ig.description, ig.creator_id, ig.member_count,
+               word_similarity(%(query)s, ig.name) AS rank
+        FROM interest_groups ig
+        WHERE %(query)s <%% ig.name
+          AND (
+              %(after_rank)s::real IS NULL
+              OR (word_similarity(%(query)s, ig.name), ig.id)
+                 < (%(after_rank)s::real, %(after_id)s::uuid)
+          )
+        ORDER BY rank DESC, ig.id DESC
+        LIMIT %(limit)s
+    ) page
+    JOIN users u ON page.creator_id = u.id
+    ORDER BY page.rank DESC, page.id DESC
+"""
+
+_has_trigram = None
+
+
+def _trigram_available():
+    # Whether the pg_trgm extension is installed (see the search migration);
+    # checked once per process
+    global _has_trigram
+    if _has_trigram is None:
+        with get_db().cursor() as cur:
+            cur.execute(
+                "SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')"
+            )
+            _has_trigram = cur.fetchone()[0]
+    return _has_trigram
+
+
+@interest_groups.route("/search", methods=["GET"])
+@query_budget(4)
+def search_groups():
+    query = request.args.get("q", "").strip()
+    if not query:
+        return jsonify({"error": "No search query provided"}), 400
+    if len(query) > SEARCH_MAX_QUERY_LENGTH:
+        return (
+            jsonify(
+                {"error": f"q must be at most {SEARCH_MAX_QUERY_LENGTH} characters"}
+            ),
+            400,
+        )
+    try:
+        limit = int(request.args.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return jsonify({"error": "Invalid limit"}), 400
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        return jsonify({"error": f"limit must be between 1 and {MAX_PAGE_SIZE}"}), 400
+
+    after = None
+    mode = "fulltext"
+    cursor = request.args.get("cursor")
+    if cursor:
+        after = _decode_search_cursor(cursor)
+        # Fuzzy cursors only come from a database with pg_trgm
+        if after is None or (after[0] == "fuzzy" and not _trigram_available()):
+            return jsonify({"error": "Invalid cursor"}), 400
+        mode = after[0]
+
+    page_key = ("search",) + tuple(sorted(request.args.items(multi=True)))
+    cached = catalog_cache.get_page(page_key)
+    if cached is not None:
+        return _serve_cached(*cached, weak=True)
+
+    token = catalog_cache.page_token()
+    etag = catalog_etag(token)
+    if is_not_modified(etag):
+        return not_modified(etag, weak=True)
+
+    rows = _search_page(mode, query, after, limit)
+    if not rows and not cursor and _trigram_available():
+        mode = "fuzzy"
+        rows = _search_page(mode, query, after, limit)
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(mode, rows[-1][5], rows[-1][0])
+    groups = [GroupInfo(*row[:5]) for row in rows]
+    response = jsonify({"groups": groups, "match": mode, "next_cursor": next_cursor})
+    variants = catalog_cache.put_page(token, page_key, etag, response.get_data())
+    return cacheable(reuse_compressed(response, variants), etag, weak=True)
+
+
+def _search_page(mode, query, after, limit):
+    # Up to limit + 1 rows of (group columns..., rank)
+    with get_db().cursor() as cur:
+        cur.execute(
+            SEARCH_FUZZY_SQL if mode == "fuzzy" else SEARCH_FULLTEXT_SQL,
             {
-                "id": row[0],
-                "name": row[1],
-                "description": row[2],
-                "creator_name": row[3],
-            }
-            for row in rows
-        ]
-        return jsonify({"groups": groups}), 200
-    except psycopg.Error as e:
-        if conn:
-            conn.rollback()
-        return jsonify({"message": "An internal server error occurred"}), 500
-    finally:
-        if cur:
-            cur.close()
-        if conn:
-            conn.close()
+                "query": query,
+                "after_rank": after[1] if after else None,
+                "after_id": after[2] if after else None,
+                "limit": limit + 1,
+            },
+        )
+        return cur.fetchall()
+
+
+def _decode_search_cursor(cursor):
+    try:
+        mode, rank, group_id = _cursor_values(cursor)
+    except (TypeError, ValueError):
+        return None
+    group_id = _parse_uuid(group_id)
+    if (
+        mode not in ("fulltext", "fuzzy")
+        or type(rank) not in (int, float)
+        or group_id is None
+    ):
+        return None
+    return mode, float(rank), group_id
 
 
 @interest_groups.route("/info/<group_id>", methods=["GET"])
+@query_budget(2)
 def group_info(group_id):
-    conn = None
-    cur = None
-    try:
-        conn = get_db_connection()
-        cur = conn.cursor()
+    group_id = _canonical_id(group_id)
+    cached = catalog_cache.get_group(group_id)
+    if cached is not None:
+        return _serve_cached(*cached)
+
+    token = catalog_cache.group_token(group_id)
+    etag = version_etag([group_key(group_id)])
+    if is_not_modified(etag):
+        return not_modified(etag)
+
+    with get_db().cursor(row_factory=args_row(GroupInfo)) as cur:
+        cur.execute(f"{GROUP_INFO_SQL} WHERE ig.id = %s", (group_id,))
+        group = cur.fetchone()
+        if not group:
+            return jsonify({"error": "Group does not exist"}), 404
+        response = jsonify(group)
+        variants = catalog_cache.put_group(token, group_id, etag, response.get_data())
+        return cacheable(reuse_compressed(response, variants), etag)
+
+
+@interest_groups.route("/user/<clerk_user_id>", methods=["GET"])
+@query_budget(2)
+def user_groups(clerk_user_id):
+    # Every group the user belongs to, from their memberships
+    user = resolve_user(clerk_user_id)
+    if user is None:
+        return jsonify({"error": "User does not exist"}), 404
+
+    with get_db().cursor(row_factory=args_row(ViewerGroupInfo)) as cur:
         cur.execute(
             """
-            SELECT ig.id, ig.name, ig.description, u.display_name AS creator_name
-            FROM interest_groups ig
+            SELECT ig.id, ig.name, ig.description, u.display_name AS creator_name,
+                   ig.member_count, TRUE AS is_member,
+                   ig.creator_id = gm.user_id AS is_creator
+            FROM group_memberships gm
+            JOIN interest_groups ig ON ig.id = gm.group_id
             JOIN users u ON ig.creator_id = u.id
-            WHERE ig.id = %s
+            WHERE gm.user_id = %s
+            ORDER BY ig.name, ig.id
         """,
-            (group_id,),
+            (user[0],),
         )
-        row = cur.fetchone()
-        if not row:
-            return jsonify({"error": "Group does not exist"}), 404
-        group_info = {
-            "id": row[0],
-            "name": row[1],
-            "description": row[2],
-            "creator_name": row[3],
-        }
-        return jsonify(group_info), 200
-    except psycopg.Error as e:
-        if conn:
-            conn.rollback()
-        return jsonify({"message": "An internal server error occurred"}), 500
-    finally:
-        if cur:
-            cur.close()
-        if conn:
-            conn.close()
+        groups = cur.fetchall()
+    return jsonify({"groups": groups}), 200
 
 
-@interest_groups.route("/join/<group_id>", methods=["POST"])
-def join(group_id):
+@interest_groups.route("/info/batch", methods=["POST"])
+@query_budget(1)
+def group_info_batch():
     try:
         data = request.get_json(force=False, silent=False)
     except Exception as e:
@@ -95,59 +391,111 @@ def join(group_id):
     if not data:
         return jsonify({"error": "No data provided"}), 400
 
-    clerk_user_id = data.get("clerk_user_id")
-    if not clerk_user_id or not isinstance(clerk_user_id, str):
-        return jsonify({"error": "No user id provided / Invalid user id type"}), 400
+    group_ids = data.get("group_ids")
+
+    if not group_ids:
+        return jsonify({"error": "Missing required fields"}), 400
+    if not isinstance(group_ids, list) or not all(
+        isinstance(group_id, str) for group_id in group_ids
+    ):
+        return jsonify({"error": "Invalid data type"}), 400
+    if len(group_ids) > MAX_BATCH_SIZE:
+        return jsonify({"error": f"At most {MAX_BATCH_SIZE} ids per request"}), 400
+
+    # Ids that are not valid UUIDs cannot exist, so they skip the query
+    parsed = {group_id: _parse_uuid(group_id) for group_id in group_ids}
+    lookup = list({value for value in parsed.values() if value is not None})
+
+    found = {}
+    if lookup:
+        with get_db().cursor(row_factory=args_row(GroupInfo)) as cur:
+            cur.execute(f"{GROUP_INFO_SQL} WHERE ig.id = ANY(%s)", (lookup,))
+            for group in cur.fetchall():
+                found[group.id] = group
+
+    # Keyed by the ids exactly as sent
+    groups = {
+        group_id: found.get(value) or {"error": "Group does not exist"}
+        for group_id, value in parsed.items()
+    }
+    return jsonify({"groups": groups}), 200
 
-    conn = None
-    cur = None
 
+@interest_groups.route("/join/<group_id>", methods=["POST"])
+@query_budget(1)
+def join(group_id):
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-
-        # 1. Check user exists and get user UUID
-        cur.execute("SELECT id FROM users WHERE clerk_user_id = %s", (clerk_user_id,))
-        user_row = cur.fetchone()
-        if not user_row:
-            return jsonify({"error": "User does not exist"}), 404
-        user_uuid = user_row[0]
+        data = request.get_json(force=False, silent=False)
+    except Exception as e:
+        return jsonify({"error": "Invalid JSON", "details": str(e)}), 400
 
-        # 2. Check group exists
-        cur.execute("SELECT id FROM interest_groups WHERE id = %s", (group_id,))
-        group_row = cur.fetchone()
-        if not group_row:
-            return jsonify({"error": "Group does not exist"}), 404
-        group_uuid = group_row[0]
+    if not data:
+        return jsonify({"error": "No data provided"}), 400
 
-        # 3. Check if already a member
-        cur.execute(
-            "SELECT id FROM group_memberships WHERE user_id = %s AND group_id = %s",
-            (user_uuid, group_uuid),
-        )
-        if cur.fetchone():
-            return jsonify({"error": "User already a member of this group"}), 409
+    clerk_user_id = data.get("clerk_user_id")
+    if not clerk_user_id or not isinstance(clerk_user_id, str):
+        return jsonify({"error": "No user id provided / Invalid user id type"}), 400
 
-        # 4. Insert membership
-        cur.execute(
-            "INSERT INTO group_memberships (user_id, group_id) VALUES (%s, %s)",
-            (user_uuid, group_uuid),
-        )
-        conn.commit()
-        return jsonify({"message": "User successfully joined the group"}), 201
-
-    except psycopg.Error as e:
-        if conn:
-            conn.rollback()
-        return jsonify({"message": "An internal server error occurred"}), 500
-    finally:
-        if cur:
-            cur.close()
-        if conn:
-            conn.close()
+    # User lookup, group check, membership check, insert and member count in
+    # one statement; ON CONFLICT covers two concurrent joins for the same user.
+    # The count is shown in the group info, so its cached entry goes too
+    # (catalog pages catch up within CATALOG_CACHE_TTL, see CatalogCache).
+    join_cur, _ = execute_pipeline(
+        [
+            (
+                """
+            WITH acting_user AS (
+                SELECT id FROM users WHERE clerk_user_id = %s
+            ),
+            target_group AS (
+                SELECT id FROM interest_groups WHERE id = %s
+            ),
+            inserted AS (
+                INSERT INTO group_memberships (user_id, group_id)
+                SELECT acting_user.id, target_group.id
+                FROM acting_user, target_group
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM group_memberships gm
+                    WHERE gm.user_id = acting_user.id
+                      AND gm.group_id = target_group.id
+                )
+                ON CONFLICT DO NOTHING
+                RETURNING group_id
+            ),
+            counted AS (
+                UPDATE interest_groups
+                SET member_count = member_count + 1
+                FROM inserted
+                WHERE interest_groups.id = inserted.group_id
+            ),
+            bumped AS (
+                INSERT INTO cache_versions (key, version)
+                SELECT unnest(ARRAY['members:' || group_id, 'group:' || group_id]), 1
+                FROM inserted
+                ON CONFLICT (key) DO UPDATE SET version = cache_versions.version + 1
+            )
+            SELECT
+                EXISTS (SELECT 1 FROM acting_user),
+                EXISTS (SELECT 1 FROM target_group),
+                EXISTS (SELECT 1 FROM inserted)
+            """,
+                (clerk_user_id, group_id),
+            ),
+            publish_statement(("member_count", _canonical_id(group_id))),
+        ]
+    )
+    user_exists, group_exists, joined = join_cur.fetchone()
+    if not user_exists:
+        return jsonify({"error": "User does not exist"}), 404
+    if not group_exists:
+        return jsonify({"error": "Group does not exist"}), 404
+    if not joined:
+        return jsonify({"error": "User already a member of this group"}), 409
+    return jsonify({"message": "User successfully joined the group"}), 201
 
 
 @interest_groups.route("/leave/<group_id>", methods=["POST"])
+@query_budget(1)
 def leave(group_id):
     try:
         data = request.get_json(force=False, silent=False)
@@ -161,102 +509,420 @@ def leave(group_id):
     if not clerk_user_id or not isinstance(clerk_user_id, str):
         return jsonify({"error": "No user id provided / Invalid user id type"}), 400
 
-    conn = None
-    cur = None
+    # The delete only fires for a non-creator member; the other flags say
+    # which check stopped it.
+    leave_cur, _ = execute_pipeline(
+        [
+            (
+                """
+            WITH acting_user AS (
+                SELECT id FROM users WHERE clerk_user_id = %s
+            ),
+            target_group AS (
+                SELECT id, creator_id FROM interest_groups WHERE id = %s
+            ),
+            deleted AS (
+                DELETE FROM group_memberships gm
+                USING acting_user, target_group
+                WHERE gm.user_id = acting_user.id
+                  AND gm.group_id = target_group.id
+                  AND target_group.creator_id <> acting_user.id
+                RETURNING gm.group_id
+            ),
+            counted AS (
+                UPDATE interest_groups
+                SET member_count = member_count - 1
+                FROM deleted
+                WHERE interest_groups.id = deleted.group_id
+            ),
+            bumped AS (
+                INSERT INTO cache_versions (key, version)
+                SELECT unnest(ARRAY['members:' || group_id, 'group:' || group_id]), 1
+                FROM deleted
+                ON CONFLICT (key) DO UPDATE SET version = cache_versions.version + 1
+            )
+            SELECT
+                EXISTS (SELECT 1 FROM acting_user),
+                EXISTS (SELECT 1 FROM target_group),
+                EXISTS (
+                    SELECT 1 FROM acting_user, target_group
+                    WHERE target_group.creator_id = acting_user.id
+                ),
+                EXISTS (SELECT 1 FROM deleted)
+            """,
+                (clerk_user_id, group_id),
+            ),
+            publish_statement(("member_count", _canonical_id(group_id))),
+        ]
+    )
+    user_exists, group_exists, is_creator, left = leave_cur.fetchone()
+    if not user_exists:
+        return jsonify({"error": "User does not exist"}), 404
+    if not group_exists:
+        return jsonify({"error": "Group does not exist"}), 404
+    if is_creator:
+        return (
+            jsonify(
+                {"error": "Creators must transfer ownership before leaving the group."}
+            ),
+            403,
+        )
+    if not left:
+        return jsonify({"error": "User is not a member of this group"}), 409
+    return jsonify({"message": "User successfully left the group"}), 200
+
+
+# Bulk membership changes. Each takes (user uuid, group uuid) pairs and
+# applies them in one statement, returning one row per pair with the flags
+# needed to report its outcome.
+BULK_JOIN_SQL = """
+    WITH requested AS (
+        SELECT DISTINCT user_id, group_id
+        FROM unnest(%s::uuid[], %s::uuid[]) AS r(user_id, group_id)
+    ),
+    checked AS (
+        SELECT r.user_id, r.group_id,
+               u.id IS NOT NULL AS user_exists,
+               ig.id IS NOT NULL AS group_exists
+        FROM requested r
+        LEFT JOIN users u ON u.id = r.user_id
+        LEFT JOIN interest_groups ig ON ig.id = r.group_id
+    ),
+    inserted AS (
+        INSERT INTO group_memberships (user_id, group_id)
+        SELECT c.user_id, c.group_id
+        FROM checked c
+        WHERE c.user_exists AND c.group_exists
+          AND NOT EXISTS (
+              SELECT 1 FROM group_memberships gm
+              WHERE gm.user_id = c.user_id AND gm.group_id = c.group_id
+          )
+        ON CONFLICT DO NOTHING
+        RETURNING user_id, group_id
+    ),
+    counted AS (
+        UPDATE interest_groups ig
+        SET member_count = ig.member_count + added.n
+        FROM (SELECT group_id, count(*) AS n FROM inserted GROUP BY group_id) added
+        WHERE ig.id = added.group_id
+    ),
+    bumped AS (
+        INSERT INTO cache_versions (key, version)
+        SELECT DISTINCT key, 1 FROM (
+            SELECT unnest(ARRAY['members:' || group_id, 'group:' || group_id])
+            FROM inserted
+        ) changed(key)
+        ON CONFLICT (key) DO UPDATE SET version = cache_versions.version + 1
+    )
+    SELECT c.user_id, c.group_id, c.user_exists, c.group_exists,
+           i.group_id IS NOT NULL
+    FROM checked c
+    LEFT JOIN inserted i ON i.user_id = c.user_id AND i.group_id = c.group_id
+"""
+
+BULK_LEAVE_SQL = """
+    WITH requested AS (
+        SELECT DISTINCT user_id, group_id
+        FROM unnest(%s::uuid[], %s::uuid[]) AS r(user_id, group_id)
+    ),
+    checked AS (
+        SELECT r.user_id, r.group_id,
+               u.id IS NOT NULL AS user_exists,
+               ig.id IS NOT NULL AS group_exists,
+               ig.creator_id IS NOT DISTINCT FROM r.user_id AS is_creator
+        FROM requested r
+        LEFT JOIN users u ON u.id = r.user_id
+        LEFT JOIN interest_groups ig ON ig.id = r.group_id
+    ),
+    deleted AS (
+        DELETE FROM group_memberships gm
+        USING checked c
+        WHERE gm.user_id = c.user_id
+          AND gm.group_id = c.group_id
+          AND c.group_exists
+          AND NOT c.is_creator
+        RETURNING gm.user_id, gm.group_id
+    ),
+    counted AS (
+        UPDATE interest_groups ig
+        SET member_count = ig.member_count - removed.n
+        FROM (SELECT group_id, count(*) AS n FROM deleted GROUP BY group_id) removed
+        WHERE ig.id = removed.group_id
+    ),
+    bumped AS (
+        INSERT INTO cache_versions (key, version)
+        SELECT DISTINCT key, 1 FROM (
+            SELECT unnest(ARRAY['members:' || group_id, 'group:' || group_id])
+            FROM deleted
+        ) changed(key)
+        ON CONFLICT (key) DO UPDATE SET version = cache_versions.version + 1
+    )
+    SELECT c.user_id, c.group_id, c.user_exists, c.group_exists, c.is_creator,
+           EXISTS (
+               SELECT 1 FROM deleted d
+               WHERE d.user_id = c.user_id AND d.group_id = c.group_id
+           )
+    FROM checked c
+"""
+
+
+@interest_groups.route("/join/batch", methods=["POST"])
+@query_budget(2)
+def join_batch():
+    return _user_bulk(_join_outcomes)
+
+
+@interest_groups.route("/leave/batch", methods=["POST"])
+@query_budget(2)
+def leave_batch():
+    return _user_bulk(_leave_outcomes)
+
+
+@interest_groups.route("/members/<group_id>/add", methods=["POST"])
+@query_budget(3)
+def add_members(group_id):
+    return _group_bulk(group_id, _join_outcomes)
+
+
+@interest_groups.route("/members/<group_id>/remove", methods=["POST"])
+@query_budget(3)
+def remove_members(group_id):
+    return _group_bulk(group_id, _leave_outcomes)
+
+
+def _user_bulk(outcomes):
+    # One user, many groups: {"clerk_user_id": ..., "group_ids": [...]}
+    data, error = _bulk_request("group_ids")
+    if error:
+        return error
+
+    user = resolve_user(data["clerk_user_id"])
+    if user is None:
+        return jsonify({"error": "User does not exist"}), 404
+
+    group_ids = _parse_uuids(data["group_ids"])
+    pairs = [(user[0], group_uuid) for group_uuid in group_ids.values() if group_uuid]
+    results = outcomes(pairs)
+    return (
+        jsonify(
+            {
+                "results": {
+                    group_id: results.get((user[0], group_uuid), "group_not_found")
+                    for group_id, group_uuid in group_ids.items()
+                }
+            }
+        ),
+        200,
+    )
+
+
+def _group_bulk(group_id, outcomes):
+    # One group, many users: {"clerk_user_id": ..., "user_ids": [...]}, where
+    # clerk_user_id is the group creator or a site admin
+    data, error = _bulk_request("user_ids")
+    if error:
+        return error
+
+    group_uuid = _parse_uuid(group_id)
+    if group_uuid is None:
+        return jsonify({"error": "Group does not exist"}), 404
+    acting_user = resolve_user(data["clerk_user_id"])
+    if acting_user is None:
+        return jsonify({"error": "User does not exist"}), 404
+
+    with get_db().cursor() as cur:
+        cur.execute(
+            "SELECT creator_id FROM interest_groups WHERE id = %s", (group_uuid,)
+        )
+        row = cur.fetchone()
+    if not row:
+        return jsonify({"error": "Group does not exist"}), 404
+    if acting_user[1] != "Admin" and row[0] != acting_user[0]:
+        return jsonify({"error": "Not authorized to edit this group"}), 403
+
+    user_ids = _parse_uuids(data["user_ids"])
+    pairs = [(user_uuid, group_uuid) for user_uuid in user_ids.values() if user_uuid]
+    results = outcomes(pairs)
+    return (
+        jsonify(
+            {
+                "results": {
+                    user_id: results.get((user_uuid, group_uuid), "user_not_found")
+                    for user_id, user_uuid in user_ids.items()
+                }
+            }
+        ),
+        200,
+    )
+
 
+def _bulk_request(ids_field):
+    # (data, None) for a valid bulk body, otherwise (None, error response)
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
+        data = request.get_json(force=False, silent=False)
+    except Exception as e:
+        return None, (jsonify({"error": "Invalid JSON", "details": str(e)}), 400)
 
-        # 1. Check user exists and get user UUID
-        cur.execute("SELECT id FROM users WHERE clerk_user_id = %s", (clerk_user_id,))
-        user_row = cur.fetchone()
-        if not user_row:
-            return jsonify({"error": "User does not exist"}), 404
-        user_uuid = user_row[0]
+    if not data:
+        return None, (jsonify({"error": "No data provided"}), 400)
 
-        # 2. Check group exists and get creator_id
-        cur.execute(
-            "SELECT id, creator_id FROM interest_groups WHERE id = %s", (group_id,)
+    clerk_user_id = data.get("clerk_user_id")
+    ids = data.get(ids_field)
+    if not clerk_user_id or not ids:
+        return None, (jsonify({"error": "Missing required fields"}), 400)
+    if (
+        not isinstance(clerk_user_id, str)
+        or not isinstance(ids, list)
+        or not all(isinstance(value, str) for value in ids)
+    ):
+        return None, (jsonify({"error": "Invalid data type"}), 400)
+    if len(ids) > MAX_BATCH_SIZE:
+        return None, (
+            jsonify({"error": f"At most {MAX_BATCH_SIZE} ids per request"}),
+            400,
         )
-        group_row = cur.fetchone()
-        if not group_row:
-            return jsonify({"error": "Group does not exist"}), 404
-        group_uuid, creator_uuid = group_row
+    return data, None
 
-        # 3. Prevent creator from leaving
-        if user_uuid == creator_uuid:
-            return (
-                jsonify(
-                    {
-                        "error": "Creators must transfer ownership before leaving the group."
-                    }
-                ),
-                403,
-            )
 
-        # 4. Check if already a member
-        cur.execute(
-            "SELECT id FROM group_memberships WHERE user_id = %s AND group_id = %s",
-            (user_uuid, group_uuid),
-        )
-        if not cur.fetchone():
-            return jsonify({"error": "User is not a member of this group"}), 409
+def _parse_uuids(values):
+    # Keyed by the ids as sent; ids that are not UUIDs map to None
+    return {value: _parse_uuid(value) for value in values}
 
-        # 5. Delete membership
-        cur.execute(
-            "DELETE FROM group_memberships WHERE user_id = %s AND group_id = %s",
-            (user_uuid, group_uuid),
-        )
-        conn.commit()
-        return jsonify({"message": "User successfully left the group"}), 200
-
-    except psycopg.Error as e:
-        if conn:
-            conn.rollback()
-        return jsonify({"message": "An internal server error occurred"}), 500
-    finally:
-        if cur:
-            cur.close()
-        if conn:
-            conn.close()
+
+def _publish_groups(pairs):
+    # Member counts are part of the group info, so every group touched needs
+    # its cached entry dropped
+    group_ids = sorted({str(group_id) for _, group_id in pairs})
+    return publish_statement(*[("member_count", group_id) for group_id in group_ids])
+
+
+def _join_outcomes(pairs):
+    # {(user uuid, group uuid): outcome}
+    if not pairs:
+        return {}
+    cur, _ = execute_pipeline(
+        [
+            (BULK_JOIN_SQL, ([p[0] for p in pairs], [p[1] for p in pairs])),
+            _publish_groups(pairs),
+        ]
+    )
+    rows = cur.fetchall()
+    results = {}
+    for user_id, group_id, user_exists, group_exists, joined in rows:
+        if not user_exists:
+            outcome = "user_not_found"
+        elif not group_exists:
+            outcome = "group_not_found"
+        elif not joined:
+            outcome = "already_member"
+        else:
+            outcome = "joined"
+        results[(user_id, group_id)] = outcome
+    return results
+
+
+def _leave_outcomes(pairs):
+    # {(user uuid, group uuid): outcome}
+    if not pairs:
+        return {}
+    cur, _ = execute_pipeline(
+        [
+            (BULK_LEAVE_SQL, ([p[0] for p in pairs], [p[1] for p in pairs])),
+            _publish_groups(pairs),
+        ]
+    )
+    rows = cur.fetchall()
+    results = {}
+    for user_id, group_id, user_exists, group_exists, is_creator, left in rows:
+        if not user_exists:
+            outcome = "user_not_found"
+        elif not group_exists:
+            outcome = "group_not_found"
+        elif is_creator:
+            outcome = "creator"
+        elif not left:
+            outcome = "not_member"
+        else:
+            outcome = "left"
+        results[(user_id, group_id)] = outcome
+    return results
 
 
 @interest_groups.route("/members/<group_id>", methods=["GET"])
+@query_budget(2)
 def get_members(group_id):
-    conn = None
-    cur = None
-    try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        # Get all members of the group
-        cur.execute(
-            """
-            SELECT users.clerk_user_id, users.display_name, users.id
-            FROM group_memberships
-            JOIN users ON group_memberships.user_id = users.id
-            WHERE group_memberships.group_id = %s
-            """,
-            (group_id,),
-        )
-        rows = cur.fetchall()
-        members = [
-            {"clerk_user_id": row[0], "display_name": row[1], "user_id": row[2]}
-            for row in rows
-        ]
-        return jsonify({"members": members}), 200
-    except psycopg.Error as e:
-        if conn:
-            conn.rollback()
-        return jsonify({"message": "An internal server error occurred"}), 500
-    finally:
-        if cur:
+    stream_format = _requested_stream_format()
+    etag = version_etag([members_key(_canonical_id(group_id))], stream_format)
+    if is_not_modified(etag):
+        response = not_modified(etag)
+    elif stream_format:
+        response = cacheable(_stream_members(group_id, stream_format), etag)
+    else:
+        with get_db().cursor(row_factory=args_row(Member)) as cur:
+            # Get all members of the group
+            cur.execute(MEMBERS_SQL, (group_id,))
+            members = cur.fetchall()
+            response = cacheable(jsonify({"members": members}), etag)
+    # The representation depends on Accept (see _requested_stream_format)
+    response.vary.add("Accept")
+    return response
+
+
+MEMBERS_SQL = """
+    SELECT users.clerk_user_id, users.display_name, users.id AS user_id
+    FROM group_memberships
+    JOIN users ON group_memberships.user_id = users.id
+    WHERE group_memberships.group_id = %s
+"""
+
+
+def _requested_stream_format():
+    # Streaming is opt-in: `Accept: application/x-ndjson` or `?stream=ndjson`
+    # for one member per line, `?stream=1` for the usual {"members": [...]}
+    # document sent in chunks.
+    stream = request.args.get("stream", "")
+    if stream == "ndjson" or request.accept_mimetypes.best == NDJSON_MIMETYPE:
+        return "ndjson"
+    if stream in ("1", "true", "json"):
+        return "json"
+    return None
+
+
+def _stream_members(group_id, stream_format):
+    # A named cursor lives on the server, so only one batch of rows is held in
+    # the worker at a time however large the group is. The statement runs
+    # before the response starts, so database errors still become a 500.
+    cur = get_db().cursor(
+        name=f"members_{uuid.uuid4().hex}", row_factory=args_row(Member)
+    )
+    cur.execute(MEMBERS_SQL, (group_id,))
+    dumps = current_app.json.dumps
+
+    def generate():
+        try:
+            if stream_format == "json":
+                yield '{"members": ['
+            separator = ""
+            while True:
+                rows = cur.fetchmany(STREAM_BATCH_SIZE)
+                if not rows:
+                    break
+                if stream_format == "ndjson":
+                    yield "".join(dumps(member) + "\n" for member in rows)
+                else:
+                    yield separator + ",".join(dumps(member) for member in rows)
+                    separator = ","
+            if stream_format == "json":
+                yield "]}"
+        finally:
             cur.close()
-        if conn:
-            conn.close()
+
+    mimetype = NDJSON_MIMETYPE if stream_format == "ndjson" else "application/json"
+    return Response(stream_with_context(generate()), mimetype=mimetype)
 
 
 @interest_groups.route("/transfer_owner/<group_id>", methods=["POST"])
+@query_budget(1)
 def transfer_owner(group_id):
     try:
         data = request.get_json(force=False, silent=False)
@@ -276,96 +942,98 @@ def transfer_owner(group_id):
             400,
         )
 
-    conn = None
-    cur = None
-
-    try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-
-        # 1. Get UUID for the current user (creator)
-        cur.execute("SELECT id FROM users WHERE clerk_user_id = %s", (clerk_user_id,))
-        user_row = cur.fetchone()
-        if not user_row:
-            return jsonify({"error": "User does not exist"}), 404
-        user_uuid = user_row[0]
-
-        # 2. Check group exists and get current creator
-        cur.execute("SELECT creator_id FROM interest_groups WHERE id = %s", (group_id,))
-        group_row = cur.fetchone()
-        if not group_row:
-            return jsonify({"error": "Group does not exist"}), 404
-        creator_uuid = group_row[0]
-
-        # 3. Check if current user is the creator
-        if creator_uuid != user_uuid:
-            return jsonify({"error": "User is not the creator of this group"}), 403
-
-        # 4. Check if transfer user is a member
-        cur.execute(
-            "SELECT id FROM group_memberships WHERE user_id = %s AND group_id = %s",
-            (transfer_user_uuid, group_id),
-        )
-        if not cur.fetchone():
-            return (
-                jsonify({"error": "Transfer user is not a member of this group"}),
-                409,
-            )
-
-        # 5. Update group creator
-        cur.execute(
-            "UPDATE interest_groups SET creator_id = %s WHERE id = %s",
-            (transfer_user_uuid, group_id),
+    # The creator check is repeated against the row being updated so a
+    # concurrent transfer cannot be overwritten. The invalidation event rides
+    # in the same round trip and is only delivered if the transfer commits.
+    transfer_cur, _ = execute_pipeline(
+        [
+            (
+                """
+                WITH acting_user AS (
+                    SELECT id FROM users WHERE clerk_user_id = %s
+                ),
+                target_group AS (
+                    SELECT id, creator_id FROM interest_groups WHERE id = %s
+                ),
+                new_owner AS (
+                    SELECT gm.user_id
+                    FROM group_memberships gm, target_group
+                    WHERE gm.group_id = target_group.id AND gm.user_id = %s
+                ),
+                updated AS (
+                    UPDATE interest_groups ig
+                    SET creator_id = new_owner.user_id
+                    FROM acting_user, target_group, new_owner
+                    WHERE ig.id = target_group.id
+                      AND ig.creator_id = acting_user.id
+                    RETURNING ig.id
+                ),
+                bumped AS (
+                    INSERT INTO cache_versions (key, version)
+                    SELECT unnest(ARRAY['group:' || id, 'catalog']), 1 FROM updated
+                    ON CONFLICT (key) DO UPDATE SET version = cache_versions.version + 1
+                )
+                SELECT
+                    EXISTS (SELECT 1 FROM acting_user),
+                    EXISTS (SELECT 1 FROM target_group),
+                    EXISTS (
+                        SELECT 1 FROM acting_user, target_group
+                        WHERE target_group.creator_id = acting_user.id
+                    ),
+                    EXISTS (SELECT 1 FROM new_owner),
+                    EXISTS (SELECT 1 FROM updated)
+                """,
+                (clerk_user_id, group_id, transfer_user_uuid),
+            ),
+            publish_statement(("group", _canonical_id(group_id))),
+        ]
+    )
+    user_exists, group_exists, is_creator, is_member, transferred = (
+        transfer_cur.fetchone()
+    )
+    if not user_exists:
+        return jsonify({"error": "User does not exist"}), 404
+    if not group_exists:
+        return jsonify({"error": "Group does not exist"}), 404
+    if not is_creator or (is_member and not transferred):
+        return jsonify({"error": "User is not the creator of this group"}), 403
+    if not is_member:
+        return (
+            jsonify({"error": "Transfer user is not a member of this group"}),
+            409,
         )
-        conn.commit()
-        return jsonify({"message": "Ownership successfully transferred"}), 200
-
-    except psycopg.Error as e:
-        if conn:
-            conn.rollback()
-        return jsonify({"message": "An internal server error occurred"}), 500
-    finally:
-        if cur:
-            cur.close()
-        if conn:
-            conn.close()
+    return jsonify({"message": "Ownership successfully transferred"}), 200
 
 
 @interest_groups.route("/creator/<group_id>", methods=["GET"])
+@query_budget(2)
 def get_creator(group_id):
-    conn = None
-    cur = None
-    try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        # Get the creator's UUID
-        cur.execute("SELECT creator_id FROM interest_groups WHERE id = %s", (group_id,))
+    etag = version_etag([group_key(_canonical_id(group_id))])
+    if is_not_modified(etag):
+        return not_modified(etag)
+
+    with get_db().cursor() as cur:
+        # The group and its creator's Clerk ID in one query; a NULL clerk id
+        # means the creator row is missing
+        cur.execute(
+            """
+            SELECT u.clerk_user_id
+            FROM interest_groups ig
+            LEFT JOIN users u ON u.id = ig.creator_id
+            WHERE ig.id = %s
+            """,
+            (group_id,),
+        )
         row = cur.fetchone()
         if not row:
             return jsonify({"error": "Group does not exist"}), 404
-        creator_uuid = row[0]
-        # Get the creator's Clerk ID
-        cur.execute("SELECT clerk_user_id FROM users WHERE id = %s", (creator_uuid,))
-        user_row = cur.fetchone()
-        if not user_row:
+        if row[0] is None:
             return jsonify({"error": "Creator user does not exist"}), 404
-        return jsonify({"creator_clerk_user_id": user_row[0]}), 200
-    except psycopg.Error as e:
-        if conn:
-            conn.rollback()
-        return jsonify({"message": "An internal server error occurred"}), 500
-    finally:
-        if cur:
-            cur.close()
-        if conn:
-            conn.close()
-
-
-import psycopg
-import uuid  # Make sure this import is present
+        return cacheable(jsonify({"creator_clerk_user_id": row[0]}), etag)
 
 
 @interest_groups.route("/edit/<group_id>", methods=["PATCH"])
+@query_budget(2)
 def edit_group(group_id):
     try:
         data = request.get_json(force=False, silent=False)
@@ -379,174 +1047,170 @@ def edit_group(group_id):
     if not clerk_user_id or not isinstance(clerk_user_id, str):
         return jsonify({"error": "No user id provided / Invalid user id type"}), 400
 
-    conn = None
-    cur = None
-    try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-
-        # 1. Get user UUID and role (acting admin/creator)
-        cur.execute(
-            "SELECT id, role FROM users WHERE clerk_user_id = %s", (clerk_user_id,)
-        )
-        user_row = cur.fetchone()
-        if not user_row:
-            return jsonify({"error": "User does not exist"}), 404
-        acting_user_uuid, acting_user_role = user_row
-
-        # 2. Get group creator_id and existing members for authorization
-        cur.execute(
+    allowed_group_fields = {"name", "description", "image_url"}
+    group_updates = {k: v for k, v in data.items() if k in allowed_group_fields}
+    # Expecting `remove_member_id` / `new_owner_id` as user UUIDs
+    remove_member_id = data.get("remove_member_id")
+    new_owner_id = data.get("new_owner_id")
+    remove_member_uuid = _parse_uuid(remove_member_id)
+    new_owner_uuid = _parse_uuid(new_owner_id)
+
+    # 1. Every lookup the checks below need, sent as one pipelined batch
+    # (the acting user is only looked up when not already cached)
+    statements = [
+        ("SELECT id, creator_id FROM interest_groups WHERE id = %s", (group_id,)),
+        (
             """
-            SELECT ig.creator_id, array_agg(igm.user_id) AS current_members
-            FROM interest_groups ig
-            LEFT JOIN interest_group_members igm ON ig.id = igm.group_id
-            WHERE ig.id = %s
-            GROUP BY ig.id
+            SELECT EXISTS (
+                SELECT 1 FROM group_memberships
+                WHERE group_id = %s AND user_id = %s
+            )
             """,
-            (group_id,),
-        )
-        group_info_row = cur.fetchone()
-
-        if not group_info_row:
-            return jsonify({"error": "Group does not exist"}), 404
-        group_creator_uuid = group_info_row[0]
-        current_members = (
-            group_info_row[1]
-            if group_info_row[1] and group_info_row[1] != [None]
-            else []
+            (group_id, remove_member_uuid),
+        ),
+        (
+            """
+            SELECT
+                EXISTS (SELECT 1 FROM users WHERE id = %s),
+                EXISTS (
+                    SELECT 1 FROM group_memberships
+                    WHERE group_id = %s AND user_id = %s
+                )
+            """,
+            (new_owner_uuid, group_id, new_owner_uuid),
+        ),
+    ]
+    user = cached_user(clerk_user_id)
+    if user is None:
+        statements.append(
+            ("SELECT id, role FROM users WHERE clerk_user_id = %s", (clerk_user_id,))
         )
-
-        # 3. Authorization check: must be site admin OR group creator
-        is_site_admin = acting_user_role == "Admin"
-        is_group_creator = acting_user_uuid == group_creator_uuid
-
-        if not (is_site_admin or is_group_creator):
-            return jsonify({"error": "Not authorized to edit this group"}), 403
-
-        # --- Handle Group Name, Description, Image URL updates ---
-        allowed_group_fields = {"name", "description", "image_url"}
-        group_updates = {k: v for k, v in data.items() if k in allowed_group_fields}
-
-        if group_updates:
-            set_clause = ", ".join([f"{k} = %s" for k in group_updates.keys()])
-            values = list(group_updates.values()) + [group_id]
-            cur.execute(
-                f"UPDATE interest_groups SET {set_clause} WHERE id = %s", values
+    group_cur, remove_cur, new_owner_cur, *user_cur = execute_pipeline(statements)
+    if user is None:
+        user = user_cur[0].fetchone()
+        if not user:
+            return jsonify({"error": "User does not exist"}), 404
+        cache_user(clerk_user_id, *user)
+    acting_user_uuid, acting_user_role = user
+
+    group_row = group_cur.fetchone()
+    if not group_row:
+        return jsonify({"error": "Group does not exist"}), 404
+    group_row_id, group_creator_uuid = group_row
+
+    # 2. Authorization check: must be site admin OR group creator
+    is_site_admin = acting_user_role == "Admin"
+    is_group_creator = acting_user_uuid == group_creator_uuid
+
+    if not (is_site_admin or is_group_creator):
+        return jsonify({"error": "Not authorized to edit this group"}), 403
+
+    # 3. Validate the requested actions before writing anything
+    if remove_member_id:
+        if remove_member_uuid is None:
+            return jsonify({"error": "Invalid remove_member_id format"}), 400
+        if remove_member_uuid == group_creator_uuid:
+            return (
+                jsonify({"error": "Cannot remove the group creator from the group"}),
+                400,
+            )
+        if not remove_cur.fetchone()[0]:
+            return jsonify({"error": "User is not a member of this group"}), 404
+
+    if new_owner_id:
+        if new_owner_uuid is None:
+            return jsonify({"error": "Invalid new_owner_id format"}), 400
+        new_owner_exists, new_owner_is_member = new_owner_cur.fetchone()
+        if not new_owner_exists:
+            return jsonify({"error": "New owner user does not exist"}), 404
+        if new_owner_uuid == group_creator_uuid:
+            return (
+                jsonify({"error": "Cannot transfer ownership to the current owner"}),
+                400,
             )
 
-        # --- Handle Remove Member ---
-        # Expecting `remove_member_id` as the UUID of the user to remove
-        remove_member_id = data.get("remove_member_id")
-        if remove_member_id:
-            # Convert to UUID type for comparison
-            try:
-                remove_member_uuid = uuid.UUID(remove_member_id)
-            except ValueError:
-                return jsonify({"error": "Invalid remove_member_id format"}), 400
-
-            # Only allow removal if the acting user is the group creator or site admin
-            # And the member is not the creator themselves
-            if remove_member_uuid == group_creator_uuid:
-                return (
-                    jsonify(
-                        {"error": "Cannot remove the group creator from the group"}
-                    ),
-                    400,
-                )
+    # If no valid updates were provided at all
+    if not group_updates and not remove_member_id and not new_owner_id:
+        return jsonify({"error": "No valid fields or actions to update"}), 400
+
+    # 4. All writes, sent as a second batch
+    writes = []
+    if group_updates:
+        set_clause = ", ".join([f"{k} = %s" for k in group_updates.keys()])
+        values = list(group_updates.values()) + [group_id]
+        writes.append(
+            (f"UPDATE interest_groups SET {set_clause} WHERE id = %s", values)
+        )
 
-            if remove_member_uuid in current_members:
-                cur.execute(
-                    """
-                    DELETE FROM interest_group_members
+    if remove_member_id:
+        writes.append(
+            (
+                """
+                WITH removed AS (
+                    DELETE FROM group_memberships
                     WHERE group_id = %s AND user_id = %s
-                    """,
-                    (group_id, remove_member_uuid),
-                )
-            else:
-                return jsonify({"error": "User is not a member of this group"}), 404
-
-        # --- Handle Transfer Ownership ---
-        # Expecting `new_owner_id` as the UUID of the new owner
-        new_owner_id = data.get("new_owner_id")  # Changed from new_owner_clerk_id
-        if new_owner_id:
-            # Convert to UUID type for comparison
-            try:
-                new_owner_uuid = uuid.UUID(new_owner_id)  # Convert input to UUID
-            except ValueError:
-                return jsonify({"error": "Invalid new_owner_id format"}), 400
-
-            # Fetch the UUID of the prospective new owner (if needed, though already passed)
-            # You *could* do an extra check here to ensure the new_owner_uuid exists in your users table,
-            # but usually, frontend selects from existing users, so this is optional for basic functionality.
-            cur.execute("SELECT id FROM users WHERE id = %s", (new_owner_uuid,))
-            new_owner_row = cur.fetchone()
-            if not new_owner_row:
-                return jsonify({"error": "New owner user does not exist"}), 404
-
-            # Current creator must be the one initiating the transfer OR a site admin
-            if not (is_group_creator or is_site_admin):
-                return (
-                    jsonify(
-                        {
-                            "error": "Only the current group creator or a site admin can transfer ownership"
-                        }
-                    ),
-                    403,
-                )
-
-            if new_owner_uuid == group_creator_uuid:
-                return (
-                    jsonify(
-                        {"error": "Cannot transfer ownership to the current owner"}
-                    ),
-                    400,
+                    RETURNING group_id
                 )
+                UPDATE interest_groups
+                SET member_count = member_count - (SELECT count(*) FROM removed)
+                WHERE id = %s
+                """,
+                (group_row_id, remove_member_uuid, group_row_id),
+            )
+        )
 
-            # Ensure the new owner is a member of the group, or make them one
-            if new_owner_uuid not in current_members:
-                # Add them as a member if they aren't already
-                cur.execute(
+    if new_owner_id:
+        # Ensure the new owner is a member of the group, or make them one
+        if not new_owner_is_member:
+            writes.append(
+                (
                     """
-                    INSERT INTO interest_group_members (group_id, user_id)
-                    VALUES (%s, %s)
-                    ON CONFLICT (group_id, user_id) DO NOTHING;
+                    WITH added AS (
+                        INSERT INTO group_memberships (user_id, group_id)
+                        VALUES (%s, %s)
+                        ON CONFLICT DO NOTHING
+                        RETURNING group_id
+                    )
+                    UPDATE interest_groups
+                    SET member_count = member_count + (SELECT count(*) FROM added)
+                    WHERE id = %s
                     """,
-                    (group_id, new_owner_uuid),
+                    (new_owner_uuid, group_row_id, group_row_id),
                 )
-
-            # Update the creator_id in the interest_groups table
-            cur.execute(
+            )
+        writes.append(
+            (
                 "UPDATE interest_groups SET creator_id = %s WHERE id = %s",
                 (new_owner_uuid, group_id),
             )
+        )
 
-        # If no valid updates were provided at all
-        if (
-            not group_updates and not remove_member_id and not new_owner_id
-        ):  # Changed from new_owner_clerk_id
-            return jsonify({"error": "No valid fields or actions to update"}), 400
+    changed_keys = [group_key(group_row_id), CATALOG_KEY]
+    if remove_member_id or (new_owner_id and not new_owner_is_member):
+        changed_keys.append(members_key(group_row_id))
+    writes.append(bump_versions_statement(*changed_keys))
 
-        conn.commit()
-        return jsonify({"message": "Group updated successfully"}), 200
+    writes.append(publish_statement(("group", str(group_row_id))))
+
+    execute_pipeline(writes)
+    return jsonify({"message": "Group updated successfully"}), 200
+
+
+def _parse_uuid(value):
+    try:
+        return uuid.UUID(value)
+    except (AttributeError, TypeError, ValueError):
+        return None
 
-    except psycopg.Error as e:
-        print(f"Database error: {e}")  # Log the actual error for debugging
-        if conn:
-            conn.rollback()
-        return jsonify({"message": "An internal server error occurred"}), 500
-    except Exception as e:
-        print(f"Server error: {e}")  # Log other potential errors
-        if conn:
-            conn.rollback()
-        return jsonify({"message": "An unexpected server error occurred"}), 500
-    finally:
-        if cur:
-            cur.close()
-        if conn:
-            conn.close()
+
+def _canonical_id(group_id):
+    # Version keys use the canonical UUID text, whatever form the URL used
+    parsed = _parse_uuid(group_id)
+    return str(parsed) if parsed else group_id
 
 
 @interest_groups.route("/apply", methods=["POST"])
+@query_budget(2)
 def apply_interest_group():
     try:
         data = request.get_json(force=False, silent=False)
@@ -561,19 +1225,16 @@ def apply_interest_group():
     name = data["name"]
     description = data["description"]
     image_url = data.get("image_url")
+    if not isinstance(clerk_user_id, str):
+        return jsonify({"error": "Invalid data type"}), 400
 
-    conn = None
-    cur = None
-    try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        # Get applicant's UUID
-        cur.execute("SELECT id FROM users WHERE clerk_user_id = %s", (clerk_user_id,))
-        user_row = cur.fetchone()
-        if not user_row:
-            return jsonify({"error": "User does not exist"}), 404
-        applicant_id = user_row[0]
+    # Get applicant's UUID
+    user = resolve_user(clerk_user_id)
+    if not user:
+        return jsonify({"error": "User does not exist"}), 404
+    applicant_id = user[0]
 
+    with get_db().cursor() as cur:
         # Insert application
         cur.execute(
             """
@@ -584,29 +1245,16 @@ def apply_interest_group():
             (applicant_id, name, description, image_url),
         )
         app_id = cur.fetchone()[0]
-        conn.commit()
         return (
             jsonify({"message": "Application submitted", "application_id": app_id}),
             201,
         )
-    except psycopg.Error as e:
-        if conn:
-            conn.rollback()
-        return jsonify({"message": "An internal server error occurred"}), 500
-    finally:
-        if cur:
-            cur.close()
-        if conn:
-            conn.close()
 
 
 @interest_groups.route("/applications", methods=["GET"])
+@query_budget(1)
 def list_applications():
-    conn = None
-    cur = None
-    try:
-        conn = get_db_connection()  # Assuming get_db_connection() is defined elsewhere
-        cur = conn.cursor()
+    with get_db().cursor(row_factory=args_row(Application)) as cur:
         cur.execute(
             """
             SELECT iga.id, u.display_name AS applicant_name, iga.name, iga.description, iga.status, iga.created_at
@@ -616,38 +1264,14 @@ def list_applications():
             ORDER BY iga.created_at DESC
         """
         )
-        rows = cur.fetchall()
-        applications = [
-            {
-                "id": row[0],
-                "applicant_name": row[1],
-                "name": row[2],
-                "description": row[3],
-                "status": row[4],
-                "created_at": row[5],
-            }
-            for row in rows
-        ]
+        applications = cur.fetchall()
         return jsonify({"applications": applications}), 200
-    except psycopg.Error as e:
-        print(f"Database error: {e}")  # Log the actual error for debugging
-        if conn:
-            conn.rollback()
-        return jsonify({"message": "An internal server error occurred"}), 500
-    finally:
-        if cur:
-            cur.close()
-        if conn:
-            conn.close()
 
 
 @interest_groups.route("/application/<application_id>", methods=["GET"])
+@query_budget(1)
 def get_application(application_id):
-    conn = None
-    cur = None
-    try:
-        conn = get_db_connection()
-        cur = conn.cursor()
+    with get_db().cursor(row_factory=args_row(ApplicationDetail)) as cur:
         cur.execute(
             """
             SELECT iga.id, u.display_name AS applicant_name, iga.name, iga.description, iga.status, iga.created_at, iga.image_url
@@ -657,129 +1281,117 @@ def get_application(application_id):
         """,
             (application_id,),
         )
-        row = cur.fetchone()
-        if not row:
+        application = cur.fetchone()
+        if not application:
             return jsonify({"error": "Application not found"}), 404
-        application = {
-            "id": row[0],
-            "applicant_name": row[1],
-            "name": row[2],
-            "description": row[3],
-            "status": row[4],
-            "created_at": row[5],
-            "image_url": row[6],
-        }
         return jsonify(application), 200
-    except psycopg.Error as e:
-        if conn:
-            conn.rollback()
-        return jsonify({"message": "An internal server error occurred"}), 500
-    finally:
-        if cur:
-            cur.close()
-        if conn:
-            conn.close()
 
 
-@interest_groups.route("/application/<application_id>/approve", methods=["POST"])
-def approve_application(application_id):
-    try:
-        data = request.get_json(force=False, silent=False)
-    except Exception as e:
-        return jsonify({"error": "Invalid JSON", "details": str(e)}), 400
-
-    admin_clerk_user_id = data.get("clerk_user_id")
-    if not admin_clerk_user_id or not isinstance(admin_clerk_user_id, str):
-        return (
-            jsonify({"error": "No admin user id provided / Invalid user id type"}),
-            400,
-        )
-
-    conn = None
-    cur = None
-    try:
-        conn = get_db_connection()
-        cur = conn.cursor()
+def approval_statements(admin_clerk_user_id, application_id, group_id):
+    # approve_application's statements, minus the invalidation event, as
+    # (sql, params) for execute_pipeline; benchmarks.pipeline_latency runs
+    # the same list
+    return [
         # 1. Get admin's UUID and check role
-        cur.execute(
+        (
             "SELECT id, role FROM users WHERE clerk_user_id = %s",
             (admin_clerk_user_id,),
-        )
-        admin_row = cur.fetchone()
-        if not admin_row:
-            return jsonify({"error": "Admin user does not exist"}), 404
-        admin_uuid, admin_role = admin_row
-        if admin_role != "Admin":
-            return jsonify({"error": "Not authorized"}), 403
-
-        # 2. Get application details
-        cur.execute(
-            """
-            SELECT applicant_id, name, description, image_url, status
-            FROM interest_group_applications
-            WHERE id = %s
-        """,
+        ),
+        # 2. Get application status
+        (
+            "SELECT status FROM interest_group_applications WHERE id = %s",
             (application_id,),
-        )
-        app_row = cur.fetchone()
-        if not app_row:
-            return jsonify({"error": "Application not found"}), 404
-        applicant_id, name, description, image_url, status = app_row
-        if status != "pending":
-            return jsonify({"error": "Application already processed"}), 400
-
+        ),
         # 3. Create the interest group
-        cur.execute(
+        (
             """
-            INSERT INTO interest_groups (name, description, creator_id, image_url)
-            VALUES (%s, %s, %s, %s)
-            RETURNING id
-        """,
-            (name, description, applicant_id, image_url),
-        )
-        group_id = cur.fetchone()[0]
-
+            INSERT INTO interest_groups
+                (id, name, description, creator_id, image_url, member_count)
+            SELECT %s, iga.name, iga.description, iga.applicant_id, iga.image_url, 1
+            FROM interest_group_applications iga
+            WHERE iga.id = %s
+              AND iga.status = 'pending'
+              AND EXISTS (
+                  SELECT 1 FROM users
+                  WHERE clerk_user_id = %s AND role = 'Admin'
+              )
+            """,
+            (group_id, application_id, admin_clerk_user_id),
+        ),
         # 4. Add applicant as a member
-        cur.execute(
+        (
             """
             INSERT INTO group_memberships (user_id, group_id, role)
-            VALUES (%s, %s, 'admin')
-        """,
-            (applicant_id, group_id),
-        )
-
-        # 5. Update application status
-        cur.execute(
+            SELECT creator_id, id, 'admin' FROM interest_groups WHERE id = %s
+            """,
+            (group_id,),
+        ),
+        # 5. Update application status (re-checked under the row lock, so
+        # a concurrent approval leaves nothing to update)
+        (
             """
             UPDATE interest_group_applications
-            SET status = 'approved', admin_id = %s, reviewed_at = NOW()
+            SET status = 'approved',
+                admin_id = (SELECT id FROM users WHERE clerk_user_id = %s),
+                reviewed_at = NOW()
             WHERE id = %s
-        """,
-            (admin_uuid, application_id),
-        )
+              AND status = 'pending'
+              AND EXISTS (SELECT 1 FROM interest_groups WHERE id = %s)
+            RETURNING id
+            """,
+            (admin_clerk_user_id, application_id, group_id),
+        ),
+        # 6. New group in the catalog (undone with the rest on failure)
+        bump_versions_statement(CATALOG_KEY),
+    ]
+
 
-        conn.commit()
+@interest_groups.route("/application/<application_id>/approve", methods=["POST"])
+@query_budget(1)
+def approve_application(application_id):
+    try:
+        data = request.get_json(force=False, silent=False)
+    except Exception as e:
+        return jsonify({"error": "Invalid JSON", "details": str(e)}), 400
+
+    admin_clerk_user_id = data.get("clerk_user_id")
+    if not admin_clerk_user_id or not isinstance(admin_clerk_user_id, str):
         return (
-            jsonify(
-                {
-                    "message": "Application approved and group created",
-                    "group_id": group_id,
-                }
-            ),
-            200,
+            jsonify({"error": "No admin user id provided / Invalid user id type"}),
+            400,
         )
-    except psycopg.Error as e:
-        if conn:
-            conn.rollback()
-        return jsonify({"message": "An internal server error occurred"}), 500
-    finally:
-        if cur:
-            cur.close()
-        if conn:
-            conn.close()
+
+    # The group id is generated here so the writes below do not have to wait
+    # for the INSERT ... RETURNING; every write is conditional on the admin
+    # and pending checks, so the whole approval is one pipelined round trip.
+    group_id = uuid.uuid4()
+    admin_cur, app_cur, _, _, updated_cur, _, _ = execute_pipeline(
+        approval_statements(admin_clerk_user_id, application_id, group_id)
+        + [publish_statement(("catalog", None))]
+    )
+    admin_row = admin_cur.fetchone()
+    if not admin_row:
+        return jsonify({"error": "Admin user does not exist"}), 404
+    if admin_row[1] != "Admin":
+        return jsonify({"error": "Not authorized"}), 403
+    if not app_cur.fetchone():
+        return jsonify({"error": "Application not found"}), 404
+    if not updated_cur.fetchone():
+        return jsonify({"error": "Application already processed"}), 400
+
+    return (
+        jsonify(
+            {
+                "message": "Application approved and group created",
+                "group_id": group_id,
+            }
+        ),
+        200,
+    )
 
 
 @interest_groups.route("/application/<application_id>/reject", methods=["POST"])
+@query_budget(1)
 def reject_application(application_id):
     try:
         data = request.get_json(force=False, silent=False)
@@ -793,65 +1405,230 @@ def reject_application(application_id):
             400,
         )
 
-    conn = None
-    cur = None
-    try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        # 1. Get admin's UUID and check role
-        cur.execute(
-            "SELECT id, role FROM users WHERE clerk_user_id = %s",
-            (admin_clerk_user_id,),
-        )
-        admin_row = cur.fetchone()
-        if not admin_row:
-            return jsonify({"error": "Admin user does not exist"}), 404
-        admin_uuid, admin_role = admin_row
-        if admin_role != "Admin":
-            return jsonify({"error": "Not authorized"}), 403
-
-        # 2. Get application details
-        cur.execute(
-            """
-            SELECT status
-            FROM interest_group_applications
-            WHERE id = %s
-        """,
-            (application_id,),
-        )
-        app_row = cur.fetchone()
-        if not app_row:
-            return jsonify({"error": "Application not found"}), 404
-        status = app_row[0]
-        if status != "pending":
-            return jsonify({"error": "Application already processed"}), 400
-
-        # 3. Update application status to rejected
-        cur.execute(
-            """
-            UPDATE interest_group_applications
-            SET status = 'rejected', admin_id = %s, reviewed_at = NOW()
-            WHERE id = %s
-        """,
-            (admin_uuid, application_id),
-        )
-
-        conn.commit()
-        return (
-            jsonify(
-                {
-                    "message": "Application rejected",
-                    "application_id": application_id,
-                }
+    admin_cur, app_cur, updated_cur = execute_pipeline(
+        [
+            # 1. Get admin's UUID and check role
+            (
+                "SELECT id, role FROM users WHERE clerk_user_id = %s",
+                (admin_clerk_user_id,),
             ),
-            200,
-        )
-    except psycopg.Error as e:
-        if conn:
-            conn.rollback()
-        return jsonify({"message": "An internal server error occurred"}), 500
-    finally:
-        if cur:
-            cur.close()
-        if conn:
-            conn.close()
+            # 2. Get application status
+            (
+                "SELECT status FROM interest_group_applications WHERE id = %s",
+                (application_id,),
+            ),
+            # 3. Update application status to rejected, only if the checks pass
+            (
+                """
+                UPDATE interest_group_applications
+                SET status = 'rejected', admin_id = u.id, reviewed_at = NOW()
+                FROM users u
+                WHERE interest_group_applications.id = %s
+                  AND interest_group_applications.status = 'pending'
+                  AND u.clerk_user_id = %s
+                  AND u.role = 'Admin'
+                RETURNING interest_group_applications.id
+                """,
+                (application_id, admin_clerk_user_id),
+            ),
+        ]
+    )
+    admin_row = admin_cur.fetchone()
+    if not admin_row:
+        return jsonify({"error": "Admin user does not exist"}), 404
+    if admin_row[1] != "Admin":
+        return jsonify({"error": "Not authorized"}), 403
+    if not app_cur.fetchone():
+        return jsonify({"error": "Application not found"}), 404
+    if not updated_cur.fetchone():
+        return jsonify({"error": "Application already processed"}), 400
+
+    return (
+        jsonify(
+            {
+                "message": "Application rejected",
+                "application_id": application_id,
+            }
+        ),
+        200,
+    )
+
+
+# Set-wise review of many applications. Pending rows are locked with SKIP
+# LOCKED, so applications another admin is reviewing at the same moment are
+# reported as "busy" instead of being processed twice. The final SELECT
+# reads the statement's snapshot, i.e. each application's status before it.
+BULK_APPROVE_SQL = """
+    WITH admin AS (
+        SELECT id FROM users WHERE clerk_user_id = %s AND role = 'Admin'
+    ),
+    requested AS (
+        SELECT * FROM unnest(%s::uuid[], %s::uuid[]) AS r(id, group_id)
+    ),
+    locked AS (
+        SELECT iga.id, iga.name, iga.description, iga.applicant_id,
+               iga.image_url, r.group_id
+        FROM interest_group_applications iga
+        JOIN requested r ON r.id = iga.id
+        WHERE iga.status = 'pending'
+          AND EXISTS (SELECT 1 FROM admin)
+        FOR UPDATE OF iga SKIP LOCKED
+    ),
+    created AS (
+        INSERT INTO interest_groups
+            (id, name, description, creator_id, image_url, member_count)
+        SELECT group_id, name, description, applicant_id, image_url, 1 FROM locked
+        RETURNING id, creator_id
+    ),
+    creator_memberships AS (
+        INSERT INTO group_memberships (user_id, group_id, role)
+        SELECT creator_id, id, 'admin' FROM created
+    ),
+    updated AS (
+        UPDATE interest_group_applications iga
+        SET status = 'approved', admin_id = admin.id, reviewed_at = NOW()
+        FROM locked, admin
+        WHERE iga.id = locked.id
+        RETURNING iga.id, locked.group_id
+    ),
+    bumped AS (
+        INSERT INTO cache_versions (key, version)
+        SELECT 'catalog', 1 WHERE EXISTS (SELECT 1 FROM updated)
+        ON CONFLICT (key) DO UPDATE SET version = cache_versions.version + 1
+    )
+    SELECT r.id, iga.status, updated.group_id
+    FROM requested r
+    LEFT JOIN interest_group_applications iga ON iga.id = r.id
+    LEFT JOIN updated ON updated.id = r.id
+"""
+
+BULK_REJECT_SQL = """
+    WITH admin AS (
+        SELECT id FROM users WHERE clerk_user_id = %s AND role = 'Admin'
+    ),
+    requested AS (
+        SELECT unnest(%s::uuid[]) AS id
+    ),
+    locked AS (
+        SELECT iga.id
+        FROM interest_group_applications iga
+        JOIN requested r ON r.id = iga.id
+        WHERE iga.status = 'pending'
+          AND EXISTS (SELECT 1 FROM admin)
+        FOR UPDATE OF iga SKIP LOCKED
+    ),
+    updated AS (
+        UPDATE interest_group_applications iga
+        SET status = 'rejected', admin_id = admin.id, reviewed_at = NOW()
+        FROM locked, admin
+        WHERE iga.id = locked.id
+        RETURNING iga.id
+    )
+    SELECT r.id, iga.status, updated.id
+    FROM requested r
+    LEFT JOIN interest_group_applications iga ON iga.id = r.id
+    LEFT JOIN updated ON updated.id = r.id
+"""
+
+
+@interest_groups.route("/applications/approve", methods=["POST"])
+@query_budget(1)
+def approve_applications():
+    data, error = _bulk_request("application_ids")
+    if error:
+        return error
+
+    application_ids = _parse_uuids(data["application_ids"])
+    requested = list({value for value in application_ids.values() if value})
+    # Group ids are generated here, as in approve_application
+    group_ids = [uuid.uuid4() for _ in requested]
+    admin_cur, approve_cur, _ = execute_pipeline(
+        [
+            (
+                "SELECT id, role FROM users WHERE clerk_user_id = %s",
+                (data["clerk_user_id"],),
+            ),
+            (BULK_APPROVE_SQL, (data["clerk_user_id"], requested, group_ids)),
+            publish_statement(("catalog", None)),
+        ]
+    )
+    admin_row = admin_cur.fetchone()
+    if not admin_row:
+        return jsonify({"error": "Admin user does not exist"}), 404
+    if admin_row[1] != "Admin":
+        return jsonify({"error": "Not authorized"}), 403
+
+    outcomes = {}
+    created = {}
+    for application_id, status, group_id in approve_cur.fetchall():
+        outcomes[application_id] = _review_outcome(status, group_id, "approved")
+        if group_id:
+            created[application_id] = group_id
+    return (
+        jsonify(
+            {
+                "results": {
+                    key: outcomes.get(value, "not_found")
+                    for key, value in application_ids.items()
+                },
+                "group_ids": {
+                    key: created[value]
+                    for key, value in application_ids.items()
+                    if value in created
+                },
+            }
+        ),
+        200,
+    )
+
+
+@interest_groups.route("/applications/reject", methods=["POST"])
+@query_budget(1)
+def reject_applications():
+    data, error = _bulk_request("application_ids")
+    if error:
+        return error
+
+    application_ids = _parse_uuids(data["application_ids"])
+    requested = list({value for value in application_ids.values() if value})
+    admin_cur, reject_cur = execute_pipeline(
+        [
+            (
+                "SELECT id, role FROM users WHERE clerk_user_id = %s",
+                (data["clerk_user_id"],),
+            ),
+            (BULK_REJECT_SQL, (data["clerk_user_id"], requested)),
+        ]
+    )
+    admin_row = admin_cur.fetchone()
+    if not admin_row:
+        return jsonify({"error": "Admin user does not exist"}), 404
+    if admin_row[1] != "Admin":
+        return jsonify({"error": "Not authorized"}), 403
+
+    outcomes = {
+        application_id: _review_outcome(status, rejected, "rejected")
+        for application_id, status, rejected in reject_cur.fetchall()
+    }
+    return (
+        jsonify(
+            {
+                "results": {
+                    key: outcomes.get(value, "not_found")
+                    for key, value in application_ids.items()
+                }
+            }
+        ),
+        200,
+    )
+
+
+def _review_outcome(status, reviewed, outcome):
+    if reviewed:
+        return outcome
+    if status is None:
+        return "not_found"
+    if status != "pending":
+        return "already_processed"
+    # Still pending, so another admin held the row lock
+    return "busy"
@@ -0,0 +1,125 @@
+import csv
+import json
+
+# Bulk onboarding from a partner's roster (CSV with a header row, or NDJSON),
+# with the same fields as POST /auth: clerk_user_id, name, phone. Rows are
+# streamed into a staging table with COPY and merged into users in one
+# statement, so memory stays flat however long the roster is.
+ROSTER_FIELDS = ("clerk_user_id", "name", "phone")
+ROSTER_FORMATS = ("csv", "ndjson")
+
+# Invalid rows are skipped and counted; only the first few are described
+MAX_REPORTED_ERRORS = 20
+
+CREATE_STAGING_SQL = """
+    CREATE TEMP TABLE users_import (
+        line bigint,
+        clerk_user_id text,
+        display_name text,
+        phone_number text
+    ) ON COMMIT DROP
+"""
+
+# allow-seqscan: reads the whole staging table once. The first row wins when
+# a roster lists the same clerk_user_id twice.
+MERGE_STAGING_SQL = """
+    -- allow-seqscan
+    WITH roster AS (
+        SELECT DISTINCT ON (clerk_user_id) clerk_user_id, display_name, phone_number
+        FROM users_import
+        ORDER BY clerk_user_id, line
+    ),
+    created AS (
+        INSERT INTO users (clerk_user_id, display_name, phone_number)
+        SELECT clerk_user_id, display_name, phone_number FROM roster
+        ON CONFLICT (clerk_user_id) DO NOTHING
+        RETURNING 1
+    )
+    SELECT (SELECT count(*) FROM roster), (SELECT count(*) FROM created)
+"""
+
+
+class RosterError(ValueError):
+    # The roster as a whole is unreadable (e.g. a CSV without the header)
+    pass
+
+
+def roster_format(name):
+    # "csv" / "ndjson" from a Content-Type or file name, or None
+    name = (name or "").lower()
+    if name.endswith("csv"):
+        return "csv"
+    if name.endswith(("ndjson", "jsonl")):
+        return "ndjson"
+    return None
+
+
+def _csv_records(lines):
+    reader = csv.DictReader(lines)
+    if reader.fieldnames is None:
+        return
+    fieldnames = [name.strip() for name in reader.fieldnames]
+    missing = [field for field in ROSTER_FIELDS if field not in fieldnames]
+    if missing:
+        raise RosterError(f"CSV header is missing {', '.join(missing)}")
+    reader.fieldnames = fieldnames
+    for record in reader:
+        yield reader.line_num, record
+
+
+def _ndjson_records(lines):
+    for line_num, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_num, None
+            continue
+        yield line_num, record if isinstance(record, dict) else None
+
+
+def _validate(record):
+    # (clerk_user_id, display_name, phone_number) or an error message
+    if record is None:
+        return None, "Invalid JSON object"
+    values = [record.get(field) for field in ROSTER_FIELDS]
+    if not all(isinstance(value, str) for value in values if value is not None):
+        return None, "Invalid data type"
+    values = tuple((value or "").strip() for value in values)
+    if not all(values):
+        return None, "Missing required fields"
+    return values, None
+
+
+def import_roster(conn, lines, fmt):
+    # Loads a roster (an iterable of text lines) into users on conn, without
+    # committing. Returns the counts: created, existing (already onboarded),
+    # duplicates (repeated within the roster) and invalid (skipped rows).
+    records = _csv_records(lines) if fmt == "csv" else _ndjson_records(lines)
+    loaded = 0
+    invalid = 0
+    errors = []
+    with conn.cursor() as cur:
+        cur.execute(CREATE_STAGING_SQL)
+        with cur.copy(
+            "COPY users_import (line, clerk_user_id, display_name, phone_number) FROM STDIN"
+        ) as copy:
+            for line_num, record in records:
+                values, error = _validate(record)
+                if error:
+                    invalid += 1
+                    if len(errors) < MAX_REPORTED_ERRORS:
+                        errors.append({"line": line_num, "error": error})
+                    continue
+                copy.write_row((line_num,) + values)
+                loaded += 1
+        cur.execute(MERGE_STAGING_SQL)
+        distinct, created = cur.fetchone()
+    return {
+        "created": created,
+        "existing": distinct - created,
+        "duplicates": loaded - distinct,
+        "invalid": invalid,
+        "errors": errors,
+    }
@@ -0,0 +1,77 @@
+from dataclasses import dataclass
+
+# Row types for the queries the blueprints serialize. A cursor created with
+# row_factory=args_row(<type>) builds them straight from each row's values, in
+# order, so a query's SELECT list follows the field order; the JSON provider
+# then encodes them without an intermediate dict. __slots__ is declared by hand
+# as dataclass(slots=True) needs Python 3.10.
+
+
+@dataclass
+class GroupInfo:
+    __slots__ = ("id", "name", "description", "creator_name", "member_count")
+    id: object
+    name: str
+    description: str
+    creator_name: str
+    member_count: int
+
+
+@dataclass
+class ViewerGroupInfo:
+    # GroupInfo plus the viewing user's relation to the group
+    __slots__ = (
+        "id",
+        "name",
+        "description",
+        "creator_name",
+        "member_count",
+        "is_member",
+        "is_creator",
+    )
+    id: object
+    name: str
+    description: str
+    creator_name: str
+    member_count: int
+    is_member: bool
+    is_creator: bool
+
+
+@dataclass
+class Member:
+    __slots__ = ("clerk_user_id", "display_name", "user_id")
+    clerk_user_id: str
+    display_name: str
+    user_id: object
+
+
+@dataclass
+class Application:
+    __slots__ = ("id", "applicant_name", "name", "description", "status", "created_at")
+    id: object
+    applicant_name: str
+    name: str
+    description: str
+    status: str
+    created_at: object
+
+
+@dataclass
+class ApplicationDetail:
+    __slots__ = (
+        "id",
+        "applicant_name",
+        "name",
+        "description",
+        "status",
+        "created_at",
+        "image_url",
+    )
+    id: object
+    applicant_name: str
+    name: str
+    description: str
+    status: str
+    created_at: object
+    image_url: str
@@ -0,0 +1,113 @@
+"""Fetch and serialize a large /info/all payload: tuples + dicts + Flask's
+default JSON provider vs dataclass rows + the orjson provider.
+
+Runs GROUP_INFO_SQL against the database in DATABASE_URL (seed it first,
+e.g. python -m benchmarks.seed --groups 50000 --truncate) and reports the
+median time of each step:
+
+    python -m benchmarks.json_payload --rows 50000 --iterations 5
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+import psycopg
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from psycopg.rows import args_row
+
+from api import serialization
+from api.database import DATABASE_URL
+from api.serialization import JSONProvider
+from api.user.interest_groups import GROUP_INFO_SQL
+from api.user.records import GroupInfo
+
+QUERY = f"{GROUP_INFO_SQL} ORDER BY ig.name, ig.id LIMIT %s"
+
+
+def group_row_to_dict(row):
+    # How rows were turned into JSON-ready dicts before the row types
+    return {
+        "id": row[0],
+        "name": row[1],
+        "description": row[2],
+        "creator_name": row[3],
+        "member_count": row[4],
+    }
+
+
+def tuples_and_dicts(conn, provider, rows):
+    timings = {}
+    start = time.perf_counter()
+    with conn.cursor() as cur:
+        cur.execute(QUERY, (rows,))
+        fetched = cur.fetchall()
+    timings["fetch"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    groups = [group_row_to_dict(row) for row in fetched]
+    timings["build"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    body = provider.response({"groups": groups, "next_cursor": None}).get_data()
+    timings["encode"] = time.perf_counter() - start
+    return timings, len(fetched), len(body)
+
+
+def dataclass_rows(conn, provider, rows):
+    timings = {}
+    start = time.perf_counter()
+    with conn.cursor(row_factory=args_row(GroupInfo)) as cur:
+        cur.execute(QUERY, (rows,))
+        groups = cur.fetchall()
+    timings["fetch"] = time.perf_counter() - start
+    timings["build"] = 0.0
+
+    start = time.perf_counter()
+    body = provider.response({"groups": groups, "next_cursor": None}).get_data()
+    timings["encode"] = time.perf_counter() - start
+    return timings, len(groups), len(body)
+
+
+def measure(conn, run, provider, rows, iterations):
+    samples = []
+    for _ in range(iterations):
+        timings, count, size = run(conn, provider, rows)
+        timings["total"] = sum(timings.values())
+        samples.append(timings)
+    result = {
+        f"{step}_ms": round(statistics.median(s[step] for s in samples) * 1000, 2)
+        for step in samples[0]
+    }
+    result.update({"rows": count, "bytes": size})
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    with app.app_context(), psycopg.connect(DATABASE_URL) as conn:
+        results = {
+            "orjson": serialization.orjson is not None,
+            "before": measure(
+                conn,
+                tuples_and_dicts,
+                DefaultJSONProvider(app),
+                args.rows,
+                args.iterations,
+            ),
+            "after": measure(
+                conn, dataclass_rows, JSONProvider(app), args.rows, args.iterations
+            ),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+"""Drive the API with a concurrent request mix and report latency per route.
+
+Runs api.index:app in process (or a running server with --url) against a
+database filled by benchmarks.seed, with one client per worker thread
+picking scenarios by weight: catalog browsing, join/leave bursts and admin
+reviews. Prints throughput and p50/p95/p99 per route as JSON, tagged with
+the git commit so runs can be compared:
+
+    python -m benchmarks.seed --users 100000 --groups 10000 --truncate
+    python -m benchmarks.load --duration 30 --concurrency 8 --output before.json
+"""
+
+import argparse
+import collections
+import http.client
+import json
+import random
+import subprocess
+import threading
+import time
+from urllib.parse import quote, urlsplit
+
+import psycopg
+
+from api.database import DATABASE_URL
+
+DEFAULT_MIX = "browse=70,join_leave=20,admin=10"
+SEARCH_TERMS = ("mahjong", "tai chi", "walking", "morning", "karaoke", "park", "yoga")
+
+
+class AppClient:
+    # The Flask app in this process; no server or sockets involved
+
+    def __init__(self):
+        from api.index import app
+
+        self._client = app.test_client()
+
+    def request(self, method, path, body=None, headers=None):
+        response = self._client.open(path, method=method, json=body, headers=headers)
+        return response.status_code, response.headers, response.get_data()
+
+
+class HttpClient:
+    # A keep-alive connection to a running server
+
+    def __init__(self, url):
+        parts = urlsplit(url)
+        self._host = parts.hostname
+        self._port = parts.port or 80
+        self._conn = None
+
+    def request(self, method, path, body=None, headers=None):
+        headers = dict(headers or {})
+        data = None
+        if body is not None:
+            data = json.dumps(body)
+            headers["Content-Type"] = "application/json"
+        if self._conn is None:
+            self._conn = http.client.HTTPConnection(self._host, self._port)
+        try:
+            self._conn.request(method, path, body=data, headers=headers)
+            response = self._conn.getresponse()
+            return response.status, response.headers, response.read()
+        except (OSError, http.client.HTTPException):
+            self._conn.close()
+            self._conn = None
+            raise
+
+
+class Dataset:
+    # Ids sampled from the seeded database for the scenarios to use
+
+    def __init__(self, sample_size):
+        with psycopg.connect(DATABASE_URL) as conn:
+            self.group_ids = [
+                str(row[0])
+                for row in conn.execute(
+                    "SELECT id FROM interest_groups ORDER BY random() LIMIT %s",
+                    (sample_size,),
+                )
+            ]
+            self.clerk_user_ids = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT clerk_user_id FROM users WHERE role = 'User' ORDER BY random() LIMIT %s",
+                    (sample_size,),
+                )
+            ]
+            self.admin_clerk_user_ids = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT clerk_user_id FROM users WHERE role = 'Admin'"
+                )
+            ]
+            pending = [
+                str(row[0])
+                for row in conn.execute(
+                    "SELECT id FROM interest_group_applications WHERE status = 'pending'"
+                )
+            ]
+        if not self.group_ids or not self.clerk_user_ids:
+            raise SystemExit("No data to drive; run python -m benchmarks.seed first")
+        random.Random(0).shuffle(pending)
+        self._pending = pending
+        self._lock = threading.Lock()
+
+    def take_pending_application(self):
+        # Each application can only be reviewed once, so workers share a queue
+        with self._lock:
+            return self._pending.pop() if self._pending else None
+
+
+class Recorder:
+    def __init__(self):
+        self._timings = collections.defaultdict(list)
+        self._statuses = collections.defaultdict(collections.Counter)
+        self._lock = threading.Lock()
+        self.recording = False
+
+    def record(self, route, status, seconds):
+        if not self.recording:
+            return
+        with self._lock:
+            self._timings[route].append(seconds * 1000)
+            self._statuses[route][status] += 1
+
+    def report(self, duration):
+        routes = {}
+        total = 0
+        for route in sorted(self._timings):
+            timings = sorted(self._timings[route])
+            total += len(timings)
+            statuses = self._statuses[route]
+            routes[route] = {
+                "requests": len(timings),
+                "throughput_rps": round(len(timings) / duration, 1),
+                "errors": sum(n for status, n in statuses.items() if status >= 500),
+                "statuses": {str(s): n for s, n in sorted(statuses.items())},
+                "p50_ms": percentile(timings, 50),
+                "p95_ms": percentile(timings, 95),
+                "p99_ms": percentile(timings, 99),
+                "max_ms": round(timings[-1], 2),
+            }
+        return {
+            "requests": total,
+            "throughput_rps": round(total / duration, 1),
+            "routes": routes,
+        }
+
+
+def percentile(sorted_values, pct):
+    # Nearest-rank percentile
+    index = max(0, -(-len(sorted_values) * pct // 100) - 1)
+    return round(sorted_values[int(index)], 2)
+
+
+class Worker:
+    def __init__(self, client, dataset, recorder, rng):
+        self.client = client
+        self.data = dataset
+        self.recorder = recorder
+        self.rng = rng
+        # Clients revalidate what they have seen before
+        self.etags = {}
+
+    def call(self, route, method, path, body=None, revalidate=False):
+        headers = {}
+        if revalidate and path in self.etags:
+            headers["If-None-Match"] = self.etags[path]
+        start = time.perf_counter()
+        status, response_headers, data = self.client.request(
+            method, "/api/interest_groups" + path, body, headers
+        )
+        self.recorder.record(route, status, time.perf_counter() - start)
+        etag = response_headers.get("ETag")
+        if revalidate and etag:
+            self.etags[path] = etag
+        if status == 200 and data[:1] == b"{":
+            return json.loads(data)
+        return None
+
+    def browse(self):
+        # A few catalog pages, a search, then one group's details
+        path = "/info/all?limit=20"
+        for _ in range(self.rng.randint(1, 3)):
+            page = self.call("GET /info/all", "GET", path, revalidate=True)
+            if not page or not page.get("next_cursor"):
+                break
+            path = f"/info/all?limit=20&cursor={quote(page['next_cursor'])}"
+        term = quote(self.rng.choice(SEARCH_TERMS))
+        self.call("GET /search", "GET", f"/search?q={term}&limit=20", revalidate=True)
+        group_id = self.rng.choice(self.data.group_ids)
+        self.call("GET /info/<group_id>", "GET", f"/info/{group_id}", revalidate=True)
+        self.call(
+            "GET /members/<group_id>", "GET", f"/members/{group_id}", revalidate=True
+        )
+        self.call(
+            "GET /creator/<group_id>", "GET", f"/creator/{group_id}", revalidate=True
+        )
+
+    def join_leave(self):
+        # A user joins a handful of groups and leaves them again
+        user = {"clerk_user_id": self.rng.choice(self.data.clerk_user_ids)}
+        groups = self.rng.sample(
+            self.data.group_ids, min(self.rng.randint(1, 5), len(self.data.group_ids))
+        )
+        for group_id in groups:
+            self.call("POST /join/<group_id>", "POST", f"/join/{group_id}", user)
+        self.call("GET /user/<clerk_user_id>", "GET", f"/user/{user['clerk_user_id']}")
+        for group_id in groups:
+            self.call("POST /leave/<group_id>", "POST", f"/leave/{group_id}", user)
+
+    def admin(self):
+        # Review the queue, then approve or reject one application
+        admin = {"clerk_user_id": self.rng.choice(self.data.admin_clerk_user_ids)}
+        self.call("GET /applications", "GET", "/applications")
+        application_id = self.data.take_pending_application()
+        if application_id is None:
+            return
+        self.call(
+            "GET /application/<application_id>",
+            "GET",
+            f"/application/{application_id}",
+        )
+        action = "approve" if self.rng.random() < 0.6 else "reject"
+        self.call(
+            f"POST /application/<application_id>/{action}",
+            "POST",
+            f"/application/{application_id}/{action}",
+            admin,
+        )
+
+    def run(self, scenarios, weights, deadline):
+        while time.monotonic() < deadline:
+            scenario = self.rng.choices(scenarios, weights)[0]
+            try:
+                getattr(self, scenario)()
+            except (OSError, http.client.HTTPException) as e:
+                print(f"Request failed: {e}")
+
+
+def parse_mix(mix):
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ("browse", "join_leave", "admin"):
+            raise argparse.ArgumentTypeError(f"unknown scenario {name!r}")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="seconds")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX)
+    parser.add_argument(
+        "--url", help="a running server (e.g. http://127.0.0.1:3000) instead"
+    )
+    parser.add_argument("--sample-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--output", help="write the JSON here (the app's own logs go to stdout)"
+    )
+    args = parser.parse_args()
+
+    dataset = Dataset(args.sample_size)
+    recorder = Recorder()
+    scenarios = list(args.mix)
+    weights = [args.mix[name] for name in scenarios]
+    if not dataset.admin_clerk_user_ids and "admin" in scenarios:
+        weights[scenarios.index("admin")] = 0
+
+    workers = [
+        Worker(
+            HttpClient(args.url) if args.url else AppClient(),
+            dataset,
+            recorder,
+            random.Random(args.seed + n),
+        )
+        for n in range(args.concurrency)
+    ]
+    deadline = time.monotonic() + args.warmup + args.duration
+    threads = [
+        threading.Thread(target=worker.run, args=(scenarios, weights, deadline))
+        for worker in workers
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.warmup)
+    recorder.recording = True
+    start = time.monotonic()
+    for thread in threads:
+        thread.join()
+    duration = time.monotonic() - start
+
+    results = {
+        "commit": git_commit(),
+        "target": args.url or "in-process",
+        "concurrency": args.concurrency,
+        "mix": args.mix,
+        "duration_s": round(duration, 2),
+    }
+    results.update(recorder.report(duration))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
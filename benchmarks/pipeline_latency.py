@@ -0,0 +1,157 @@
+"""Sequential vs pipelined approve/reject round trips over a slow link.
+
+Runs against the Postgres in DATABASE_URL through a LatencyProxy, using temp
+tables that shadow the real ones, so nothing outside the session is touched:
+
+    python -m benchmarks.pipeline_latency --delay-ms 10 --iterations 50
+"""
+
+import argparse
+import json
+import statistics
+import time
+import uuid
+
+import psycopg
+from psycopg.conninfo import conninfo_to_dict, make_conninfo
+
+from api.database import DATABASE_URL, execute_pipeline
+from api.invalidation import notify_statement
+from api.user.interest_groups import approval_statements
+from benchmarks.latency_proxy import LatencyProxy
+
+SCHEMA = """
+CREATE TEMP TABLE users (
+    id uuid PRIMARY KEY,
+    clerk_user_id text UNIQUE NOT NULL,
+    role text NOT NULL DEFAULT 'User'
+);
+CREATE TEMP TABLE interest_groups (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    name text, description text, creator_id uuid, image_url text,
+    member_count integer NOT NULL DEFAULT 0
+);
+CREATE TEMP TABLE group_memberships (
+    user_id uuid, group_id uuid, role text,
+    PRIMARY KEY (user_id, group_id)
+);
+CREATE TEMP TABLE interest_group_applications (
+    id uuid PRIMARY KEY,
+    applicant_id uuid, name text, description text, image_url text,
+    status text NOT NULL DEFAULT 'pending',
+    admin_id uuid, reviewed_at timestamptz
+);
+CREATE TEMP TABLE cache_versions (
+    key text PRIMARY KEY,
+    version bigint NOT NULL DEFAULT 1
+);
+"""
+
+
+def upstream_address(conninfo):
+    params = conninfo_to_dict(conninfo)
+    host = params.get("host") or "localhost"
+    port = int(params.get("port") or 5432)
+    if host.startswith("/"):
+        return f"{host}/.s.PGSQL.{port}"
+    return (host, port)
+
+
+def seed(conn, applicant_id, admin_id):
+    conn.execute(SCHEMA)
+    conn.execute(
+        "INSERT INTO users (id, clerk_user_id, role) VALUES (%s, 'applicant', 'User'), (%s, 'admin', 'Admin')",
+        (applicant_id, admin_id),
+    )
+
+
+def new_application(conn, applicant_id):
+    app_id = uuid.uuid4()
+    conn.execute(
+        "INSERT INTO interest_group_applications (id, applicant_id, name, description) VALUES (%s, %s, 'Walking', 'Morning walks')",
+        (app_id, applicant_id),
+    )
+    return app_id
+
+
+def approve_sequential(conn, app_id):
+    # The statement-per-round-trip flow approve_application used to run
+    cur = conn.cursor()
+    cur.execute("SELECT id, role FROM users WHERE clerk_user_id = %s", ("admin",))
+    admin_uuid, _ = cur.fetchone()
+    cur.execute(
+        "SELECT applicant_id, name, description, image_url, status FROM interest_group_applications WHERE id = %s",
+        (app_id,),
+    )
+    applicant_id, name, description, image_url, _ = cur.fetchone()
+    cur.execute(
+        "INSERT INTO interest_groups (name, description, creator_id, image_url) VALUES (%s, %s, %s, %s) RETURNING id",
+        (name, description, applicant_id, image_url),
+    )
+    group_id = cur.fetchone()[0]
+    cur.execute(
+        "INSERT INTO group_memberships (user_id, group_id, role) VALUES (%s, %s, 'admin')",
+        (applicant_id, group_id),
+    )
+    cur.execute(
+        "UPDATE interest_group_applications SET status = 'approved', admin_id = %s, reviewed_at = NOW() WHERE id = %s",
+        (admin_uuid, app_id),
+    )
+
+
+def approve_pipelined(conn, app_id):
+    # The statements approve_application runs, with the notification it
+    # publishes (sent only if the transaction commits, which it never does here)
+    group_id = uuid.uuid4()
+    _, _, _, _, updated_cur, _, _ = execute_pipeline(
+        approval_statements("admin", app_id, group_id)
+        + [notify_statement(("catalog", None))],
+        conn=conn,
+    )
+    assert updated_cur.fetchone(), "pipelined approval did not apply"
+
+
+def measure(conn, applicant_id, approve, iterations):
+    timings = []
+    for _ in range(iterations):
+        app_id = new_application(conn, applicant_id)
+        start = time.perf_counter()
+        approve(conn, app_id)
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "iterations": iterations,
+        "p50_ms": round(statistics.median(timings), 2),
+        "mean_ms": round(statistics.mean(timings), 2),
+        "max_ms": round(max(timings), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--delay-ms", type=float, default=10.0, help="one-way delay")
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    with LatencyProxy(upstream_address(DATABASE_URL), args.delay_ms / 1000) as proxy:
+        conninfo = make_conninfo(
+            DATABASE_URL, host=proxy.host, port=proxy.port, sslmode="disable"
+        )
+        with psycopg.connect(conninfo) as conn:
+            applicant_id, admin_id = uuid.uuid4(), uuid.uuid4()
+            seed(conn, applicant_id, admin_id)
+            results = {
+                "delay_ms": args.delay_ms,
+                "sequential": measure(
+                    conn, applicant_id, approve_sequential, args.iterations
+                ),
+                "pipelined": measure(
+                    conn, applicant_id, approve_pipelined, args.iterations
+                ),
+            }
+            conn.rollback()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""Seed the database with synthetic users, groups, memberships and applications.
+
+Every table is loaded with COPY, streaming rows as they are generated, so
+millions of rows take constant memory. Ids and values come from a seeded RNG,
+so the same arguments always produce the same data. Meant for a local
+database at `alembic upgrade head`:
+
+    python -m benchmarks.seed --users 100000 --groups 10000 --truncate
+"""
+
+import argparse
+import json
+import random
+import time
+
+import psycopg
+
+from api.database import DATABASE_URL
+
+ACTIVITIES = (
+    "mahjong",
+    "tai chi",
+    "walking",
+    "gardening",
+    "karaoke",
+    "chess",
+    "baking",
+    "knitting",
+    "photography",
+    "line dancing",
+    "calligraphy",
+    "birdwatching",
+    "book",
+    "cooking",
+    "badminton",
+    "yoga",
+)
+DESCRIPTORS = (
+    "morning",
+    "evening",
+    "weekend",
+    "beginners",
+    "friendly",
+    "neighbourhood",
+    "senior",
+    "community",
+)
+PLACES = ("community centre", "park", "library", "void deck", "online", "clubhouse")
+
+# id namespaces, so seeded rows are recognisable and never collide
+USER_PREFIX = 0x5EED0001
+GROUP_PREFIX = 0x5EED0002
+APPLICATION_PREFIX = 0x5EED0003
+
+
+def seed_id(prefix, n):
+    # Text is all COPY needs, and much cheaper than building uuid.UUIDs
+    return f"{prefix:08x}-0000-4000-8000-{n:012x}"
+
+
+def clerk_id(n):
+    return f"bench_user_{n}"
+
+
+def group_name(rng, n):
+    return f"{rng.choice(DESCRIPTORS)} {rng.choice(ACTIVITIES)} club {n}"
+
+
+def group_description(rng):
+    activity = rng.choice(ACTIVITIES)
+    return (
+        f"{rng.choice(DESCRIPTORS).capitalize()} {activity} sessions at the "
+        f"{rng.choice(PLACES)}. All levels welcome, {rng.choice(ACTIVITIES)} too."
+    )
+
+
+def creator_of(group, users):
+    return group % users
+
+
+def popular_group(rng, groups):
+    # Skewed towards low group numbers, so a few groups are large
+    return int(groups * rng.random() ** 2)
+
+
+def copy_users(cur, rng, users, admins):
+    with cur.copy(
+        "COPY users (id, clerk_user_id, display_name, phone_number, role) FROM STDIN"
+    ) as copy:
+        for n in range(users):
+            copy.write_row(
+                (
+                    seed_id(USER_PREFIX, n),
+                    clerk_id(n),
+                    f"Senior {n}",
+                    f"+65 {rng.randrange(80000000, 99999999)}",
+                    "Admin" if n < admins else "User",
+                )
+            )
+
+
+def copy_groups(cur, rng, groups, users):
+    with cur.copy(
+        "COPY interest_groups (id, name, description, creator_id) FROM STDIN"
+    ) as copy:
+        for n in range(groups):
+            copy.write_row(
+                (
+                    seed_id(GROUP_PREFIX, n),
+                    group_name(rng, n),
+                    group_description(rng),
+                    seed_id(USER_PREFIX, creator_of(n, users)),
+                )
+            )
+
+
+def copy_memberships(cur, rng, users, groups, per_user):
+    # Every creator is an admin member of their group; on top of that each
+    # user joins up to per_user other groups
+    count = 0
+    per_user = min(per_user, groups)
+    with cur.copy(
+        "COPY group_memberships (user_id, group_id, role) FROM STDIN"
+    ) as copy:
+        for group in range(groups):
+            copy.write_row(
+                (
+                    seed_id(USER_PREFIX, creator_of(group, users)),
+                    seed_id(GROUP_PREFIX, group),
+                    "admin",
+                )
+            )
+            count += 1
+        for user in range(users):
+            joined = set()
+            for _ in range(per_user * 4):
+                if len(joined) == per_user:
+                    break
+                group = popular_group(rng, groups)
+                if group in joined or creator_of(group, users) == user:
+                    continue
+                joined.add(group)
+                copy.write_row(
+                    (
+                        seed_id(USER_PREFIX, user),
+                        seed_id(GROUP_PREFIX, group),
+                        "member",
+                    )
+                )
+            count += len(joined)
+    return count
+
+
+def copy_applications(cur, rng, applications, users, admins):
+    with cur.copy(
+        """
+        COPY interest_group_applications
+            (id, applicant_id, name, description, status, admin_id, reviewed_at)
+        FROM STDIN
+        """
+    ) as copy:
+        for n in range(applications):
+            status = rng.choices(("pending", "approved", "rejected"), (5, 3, 2))[0]
+            reviewed = status != "pending"
+            copy.write_row(
+                (
+                    seed_id(APPLICATION_PREFIX, n),
+                    seed_id(USER_PREFIX, rng.randrange(users)),
+                    group_name(rng, f"application {n}"),
+                    group_description(rng),
+                    status,
+                    seed_id(USER_PREFIX, rng.randrange(admins)) if reviewed else None,
+                    "now" if reviewed else None,
+                )
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--groups", type=int, default=1000)
+    parser.add_argument("--memberships-per-user", type=int, default=5)
+    parser.add_argument("--applications", type=int, default=2000)
+    parser.add_argument("--admins", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--truncate",
+        action="store_true",
+        help="delete all existing users, groups and applications first",
+    )
+    args = parser.parse_args()
+    if args.users < 1 or args.groups < 1:
+        parser.error("--users and --groups must be at least 1")
+    admins = max(1, min(args.admins, args.users))
+
+    rng = random.Random(args.seed)
+    timings = {}
+    with psycopg.connect(DATABASE_URL) as conn:
+        with conn.cursor() as cur:
+            # The generated rows are consistent by construction, so skip the
+            # per-row foreign key triggers (needs a superuser, as a local
+            # database usually has)
+            try:
+                with conn.transaction():
+                    cur.execute("SET session_replication_role = replica")
+            except psycopg.errors.InsufficientPrivilege:
+                pass
+            if args.truncate:
+                cur.execute(
+                    """
+                    TRUNCATE group_memberships, interest_group_applications,
+                             interest_groups, users, cache_versions
+                    """
+                )
+
+            start = time.perf_counter()
+            copy_users(cur, rng, args.users, admins)
+            timings["users"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            copy_groups(cur, rng, args.groups, args.users)
+            timings["interest_groups"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            memberships = copy_memberships(
+                cur, rng, args.users, args.groups, args.memberships_per_user
+            )
+            # Recounted in one pass rather than maintained row by row
+            cur.execute(
+                """
+                UPDATE interest_groups ig
+                SET member_count = counts.member_count
+                FROM (
+                    SELECT group_id, count(*) AS member_count
+                    FROM group_memberships
+                    GROUP BY group_id
+                ) counts
+                WHERE counts.group_id = ig.id
+                """
+            )
+            timings["group_memberships"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            copy_applications(cur, rng, args.applications, args.users, admins)
+            timings["interest_group_applications"] = time.perf_counter() - start
+        conn.commit()
+
+        start = time.perf_counter()
+        conn.execute("ANALYZE")
+        timings["analyze"] = time.perf_counter() - start
+
+    rows = {
+        "users": args.users,
+        "interest_groups": args.groups,
+        "group_memberships": memberships,
+        "interest_group_applications": args.applications,
+    }
+    print(
+        json.dumps(
+            {
+                "rows": rows,
+                "seconds": {k: round(v, 2) for k, v in timings.items()},
+                "admin_clerk_user_ids": [clerk_id(n) for n in range(admins)],
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import os
+from logging.config import fileConfig
+
+from alembic import context
+from dotenv import load_dotenv
+from sqlalchemy import engine_from_config, pool
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+# The app connects with psycopg 3 using DATABASE_URL; point SQLAlchemy at the
+# same database through its psycopg (3) dialect.
+load_dotenv()
+database_url = os.getenv("DATABASE_URL")
+if not database_url:
+    raise ValueError(
+        "DATABASE_URL environment variable not set. Please create a .env file."
+    )
+for prefix in ("postgresql://", "postgres://"):
+    if database_url.startswith(prefix):
+        database_url = "postgresql+psycopg://" + database_url[len(prefix) :]
+config.set_main_option("sqlalchemy.url", database_url.replace("%", "%%"))
+
+# Migrations are written by hand (the app has no SQLAlchemy models)
+target_metadata = None
+
+
+def run_migrations_offline():
+    # `alembic upgrade --sql`: print the SQL instead of running it
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url"),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+
+    with connectable.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,101 @@
+"""indexes and unique constraints for the API's queries
+
+Revision ID: 675e28a632f8
+Revises: d95729b53aa3
+Create Date: 2026-10-18 09:10:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "675e28a632f8"
+down_revision = "d95729b53aa3"
+branch_labels = None
+depends_on = None
+
+
+def _add_unique(table, name, columns):
+    # Skipped where a hand-made database already has the constraint
+    op.execute(
+        f"""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = '{name}') THEN
+                ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE ({columns});
+            END IF;
+        END $$
+        """
+    )
+
+
+def upgrade():
+    # Every request resolves its clerk_user_id; authUser's ON CONFLICT needs it
+    _add_unique("users", "users_clerk_user_id_key", "clerk_user_id")
+
+    # Duplicate memberships (possible before join used ON CONFLICT) would
+    # block the constraint; keep one row of each pair
+    op.execute(
+        """
+        DELETE FROM group_memberships a
+        USING group_memberships b
+        WHERE a.user_id = b.user_id
+          AND a.group_id = b.group_id
+          AND a.ctid > b.ctid
+        """
+    )
+    # Membership checks and a user's groups; join's ON CONFLICT arbiter
+    _add_unique(
+        "group_memberships",
+        "group_memberships_user_id_group_id_key",
+        "user_id, group_id",
+    )
+    # Member lists and per-group membership checks
+    op.create_index(
+        "ix_group_memberships_group_id_user_id",
+        "group_memberships",
+        ["group_id", "user_id"],
+        if_not_exists=True,
+    )
+
+    # /info/all keyset pagination: ORDER BY name, id with (name, id) > cursor
+    op.create_index(
+        "ix_interest_groups_name_id",
+        "interest_groups",
+        ["name", "id"],
+        if_not_exists=True,
+    )
+    # ?creator= filter and the foreign key
+    op.create_index(
+        "ix_interest_groups_creator_id",
+        "interest_groups",
+        ["creator_id"],
+        if_not_exists=True,
+    )
+
+    # The review queue: only the few unreviewed rows, newest first
+    op.create_index(
+        "ix_interest_group_applications_pending_created_at",
+        "interest_group_applications",
+        [sa.text("created_at DESC")],
+        postgresql_where=sa.text("status IN ('pending', 'new')"),
+        if_not_exists=True,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "ix_interest_group_applications_pending_created_at",
+        table_name="interest_group_applications",
+    )
+    op.drop_index("ix_interest_groups_creator_id", table_name="interest_groups")
+    op.drop_index("ix_interest_groups_name_id", table_name="interest_groups")
+    op.drop_index(
+        "ix_group_memberships_group_id_user_id", table_name="group_memberships"
+    )
+    op.execute(
+        "ALTER TABLE group_memberships "
+        "DROP CONSTRAINT IF EXISTS group_memberships_user_id_group_id_key"
+    )
+    op.execute("ALTER TABLE users DROP CONSTRAINT IF EXISTS users_clerk_user_id_key")
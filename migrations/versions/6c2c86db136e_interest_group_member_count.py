@@ -0,0 +1,41 @@
+"""interest group member count
+
+Revision ID: 6c2c86db136e
+Revises: 675e28a632f8
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "6c2c86db136e"
+down_revision = "675e28a632f8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Kept up to date by every write that adds or removes memberships; the
+    # reconcile-member-counts command repairs any drift
+    op.add_column(
+        "interest_groups",
+        sa.Column("member_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.execute(
+        """
+        UPDATE interest_groups ig
+        SET member_count = counts.member_count
+        FROM (
+            SELECT group_id, count(*) AS member_count
+            FROM group_memberships
+            GROUP BY group_id
+        ) counts
+        WHERE ig.id = counts.group_id
+        """
+    )
+
+
+def downgrade():
+    op.drop_column("interest_groups", "member_count")
@@ -0,0 +1,63 @@
+"""cache versions and invalidation trigger
+
+Revision ID: d95729b53aa3
+Revises: a60f84590157
+Create Date: 2026-10-18 09:05:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "d95729b53aa3"
+down_revision = "a60f84590157"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # These replace the old sql/ scripts and are a no-op where those were
+    # already applied.
+
+    # Version counters behind the ETags of the interest group read endpoints.
+    # Keys: 'catalog', 'group:<group id>', 'members:<group id>'.
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS cache_versions (
+            key text PRIMARY KEY,
+            version bigint NOT NULL DEFAULT 1
+        )
+        """
+    )
+
+    # Publishes a cache invalidation event whenever a user's role changes or
+    # the user is removed, so every API instance drops its cached (uuid, role)
+    # entry even when the change is made outside the API (api/invalidation.py).
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_user_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify(
+                'seniorconnect_invalidate',
+                json_build_object('kind', 'user', 'key', OLD.clerk_user_id)::text
+            );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute("DROP TRIGGER IF EXISTS users_notify_changed ON users")
+    op.execute(
+        """
+        CREATE TRIGGER users_notify_changed
+            AFTER UPDATE OF role, clerk_user_id OR DELETE ON users
+            FOR EACH ROW EXECUTE FUNCTION notify_user_changed()
+        """
+    )
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS users_notify_changed ON users")
+    op.execute("DROP FUNCTION IF EXISTS notify_user_changed()")
+    op.execute("DROP TABLE IF EXISTS cache_versions")
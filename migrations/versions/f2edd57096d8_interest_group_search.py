@@ -0,0 +1,61 @@
+"""interest group search
+
+Revision ID: f2edd57096d8
+Revises: 6c2c86db136e
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "f2edd57096d8"
+down_revision = "6c2c86db136e"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Generated from name (weight A) and description (weight B), so every
+    # write path (edit_group, approvals, ...) keeps it current by itself
+    op.execute(
+        """
+        ALTER TABLE interest_groups
+        ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(name, '')), 'A')
+            || setweight(to_tsvector('english', coalesce(description, '')), 'B')
+        ) STORED
+        """
+    )
+    op.create_index(
+        "ix_interest_groups_search_vector",
+        "interest_groups",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+
+    # Typo-tolerant fallback on names. pg_trgm ships with Postgres but is not
+    # installed everywhere; without it search simply has no fuzzy fallback.
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'
+            ) THEN
+                CREATE EXTENSION IF NOT EXISTS pg_trgm;
+                CREATE INDEX IF NOT EXISTS ix_interest_groups_name_trgm
+                    ON interest_groups USING gin (name gin_trgm_ops);
+            ELSE
+                RAISE WARNING 'pg_trgm is not available: fuzzy search disabled';
+            END IF;
+        END $$
+        """
+    )
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_interest_groups_name_trgm")
+    op.drop_index("ix_interest_groups_search_vector", table_name="interest_groups")
+    op.drop_column("interest_groups", "search_vector")
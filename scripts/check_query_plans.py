@@ -0,0 +1,191 @@
+# Fails if any SQL query in the API would need a sequential scan.
+#
+#   alembic upgrade head
+#   python scripts/check_query_plans.py
+#
+# Run against a local database at the latest migration (DATABASE_URL, .env is
+# loaded). Every SQL string in api/ is found statically, prepared with a
+# generic plan and EXPLAINed with sequential scans disabled, so the plan
+# shows whether an index can serve it even on near-empty tables. A query
+# whose plan still has a Seq Scan (or an index scan that only filters, i.e. a
+# seq scan in disguise) is reported. Queries that are meant to read a whole
+# table carry an `-- allow-seqscan` comment; ones marked
+# `-- requires-extension: <name>` are skipped if that extension is missing.
+import ast
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+import psycopg
+from dotenv import load_dotenv
+
+ROOT = Path(__file__).resolve().parent.parent
+SOURCE_DIR = ROOT / "api"
+
+SQL_START = re.compile(r"^\s*(?:--[^\n]*\n\s*)*(SELECT|WITH|INSERT|UPDATE|DELETE)\b")
+ALLOW_MARKER = "-- allow-seqscan"
+# Queries only used when an optional extension is installed
+REQUIRES_EXTENSION = re.compile(r"-- requires-extension: (\w+)")
+
+# Values for locals that f-string queries interpolate. Only the shape matters
+# (the plan is generic), so each gets one representative value.
+DYNAMIC_FRAGMENTS = {
+    "where_clause": "",
+    "set_clause": "name = %s",
+}
+
+
+def find_queries(path):
+    # [(line, sql)] for every SQL string literal / f-string in the file.
+    # Module-level constants that other queries interpolate are fragments,
+    # not queries, and are checked as part of those.
+    tree = ast.parse(path.read_text(), filename=str(path))
+    constants = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and isinstance(node.value, ast.Constant):
+            for target in node.targets:
+                if isinstance(target, ast.Name) and isinstance(node.value.value, str):
+                    constants[target.id] = node.value.value
+
+    fragments = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.FormattedValue) and isinstance(node.value, ast.Name):
+            if node.value.id in constants:
+                fragments.add(constants[node.value.id])
+
+    queries = []
+    inside_fstring = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.JoinedStr):
+            for value in node.values:
+                inside_fstring.add(id(value))
+            sql = render_fstring(node, constants)
+            if sql and SQL_START.match(sql):
+                queries.append((node.lineno, sql))
+        elif (
+            isinstance(node, ast.Constant)
+            and isinstance(node.value, str)
+            and id(node) not in inside_fstring
+            and node.value not in fragments
+            and SQL_START.match(node.value)
+        ):
+            queries.append((node.lineno, node.value))
+    return queries
+
+
+def render_fstring(node, constants):
+    parts = []
+    for value in node.values:
+        if isinstance(value, ast.Constant):
+            parts.append(value.value)
+        elif isinstance(value, ast.FormattedValue) and isinstance(
+            value.value, ast.Name
+        ):
+            name = value.value.id
+            if name in constants:
+                parts.append(constants[name])
+            elif name in DYNAMIC_FRAGMENTS:
+                parts.append(DYNAMIC_FRAGMENTS[name])
+            else:
+                return None
+        else:
+            return None
+    return "".join(parts)
+
+
+def to_prepared(sql):
+    # psycopg placeholders (%s, %(name)s) -> server-side $n parameters
+    names = {}
+    count = 0
+
+    def number(match):
+        nonlocal count
+        name = match.group(1)
+        if name is not None and name in names:
+            return names[name]
+        count += 1
+        if name is not None:
+            names[name] = f"${count}"
+        return f"${count}"
+
+    sql = re.sub(r"(?<!%)%(?:\((\w+)\))?s", number, sql).replace("%%", "%")
+    return sql, count
+
+
+def problems(plan):
+    found = []
+    node_type = plan.get("Node Type")
+    if node_type == "Seq Scan":
+        found.append(f"Seq Scan on {plan.get('Relation Name')}")
+    elif (
+        node_type in ("Index Scan", "Index Only Scan")
+        and "Index Cond" not in plan
+        and "Filter" in plan
+    ):
+        found.append(
+            f"{node_type} on {plan.get('Relation Name')} without an index condition"
+            f" (filter: {plan['Filter']})"
+        )
+    for child in plan.get("Plans", []):
+        found.extend(problems(child))
+    return found
+
+
+def check(conn, sql):
+    prepared, count = to_prepared(sql)
+    # PREPARE only plans the statement, so data-modifying queries are safe
+    conn.execute("DEALLOCATE ALL")
+    conn.execute(f"PREPARE plan_check AS {prepared}")
+    args = f"({', '.join(['NULL'] * count)})" if count else ""
+    row = conn.execute(f"EXPLAIN (FORMAT JSON) EXECUTE plan_check{args}").fetchone()
+    plan = row[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return problems(plan[0]["Plan"])
+
+
+def main():
+    load_dotenv()
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        print("DATABASE_URL environment variable not set.")
+        return 2
+
+    failures = 0
+    checked = 0
+    # prepare_threshold=None keeps psycopg from preparing statements of its own
+    with psycopg.connect(database_url, autocommit=True, prepare_threshold=None) as conn:
+        conn.execute("SET enable_seqscan = off")
+        conn.execute("SET plan_cache_mode = force_generic_plan")
+        extensions = {
+            row[0] for row in conn.execute("SELECT extname FROM pg_extension")
+        }
+        for path in sorted(SOURCE_DIR.rglob("*.py")):
+            for line, sql in find_queries(path):
+                where = f"{path.relative_to(ROOT)}:{line}"
+                if ALLOW_MARKER in sql:
+                    continue
+                required = REQUIRES_EXTENSION.search(sql)
+                if required and required.group(1) not in extensions:
+                    print(f"{where}: skipped, needs the {required.group(1)} extension")
+                    continue
+                checked += 1
+                try:
+                    found = check(conn, sql)
+                except psycopg.Error as e:
+                    print(f"{where}: could not plan query: {e}")
+                    failures += 1
+                    continue
+                for problem in found:
+                    print(f"{where}: {problem}")
+                if found:
+                    failures += 1
+
+    print(f"{checked} queries checked, {failures} failing")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
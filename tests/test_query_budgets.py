@@ -0,0 +1,423 @@
+import os
+import uuid
+from types import SimpleNamespace
+
+import psycopg
+import pytest
+from dotenv import load_dotenv
+
+# Drives every /api route with app.testing set, so a request that makes more
+# database round trips than its @query_budget(n) raises QueryBudgetExceeded.
+# Needs a disposable database at `alembic upgrade head` in DATABASE_URL; the
+# rows each test creates are removed afterwards.
+load_dotenv()
+if not os.getenv("DATABASE_URL"):
+    pytest.skip("DATABASE_URL is not set", allow_module_level=True)
+
+# Invalidation events are applied in-process; a listener thread would clear
+# the caches at an arbitrary point in the middle of a test
+os.environ.setdefault("CACHE_INVALIDATION_LISTENER", "0")
+
+from api.database import DATABASE_URL
+from api.index import app as flask_app
+from api.invalidation import apply_event
+from api.tracing import QueryBudgetExceeded
+
+
+@pytest.fixture
+def app():
+    flask_app.testing = True
+    yield flask_app
+    flask_app.testing = False
+
+
+@pytest.fixture
+def client(app):
+    # Every request starts with empty caches, so it takes its worst-case path
+    client = app.test_client()
+    original_open = client.open
+
+    def open_uncached(*args, **kwargs):
+        apply_event("reset")
+        return original_open(*args, **kwargs)
+
+    client.open = open_uncached
+    return client
+
+
+def _add_user(conn, clerk_user_id, role="User"):
+    return conn.execute(
+        """
+        INSERT INTO users (clerk_user_id, display_name, phone_number, role)
+        VALUES (%s, %s, '12345678', %s)
+        RETURNING id
+        """,
+        (clerk_user_id, clerk_user_id, role),
+    ).fetchone()[0]
+
+
+def _add_group(conn, name, creator_id, member_ids):
+    group_id = conn.execute(
+        """
+        INSERT INTO interest_groups (name, description, creator_id, member_count)
+        VALUES (%s, 'Weekly games at the community centre', %s, %s)
+        RETURNING id
+        """,
+        (name, creator_id, 1 + len(member_ids)),
+    ).fetchone()[0]
+    conn.execute(
+        "INSERT INTO group_memberships (user_id, group_id, role) VALUES (%s, %s, 'admin')",
+        (creator_id, group_id),
+    )
+    for member_id in member_ids:
+        conn.execute(
+            "INSERT INTO group_memberships (user_id, group_id) VALUES (%s, %s)",
+            (member_id, group_id),
+        )
+    return group_id
+
+
+def _add_application(conn, applicant_id):
+    return conn.execute(
+        """
+        INSERT INTO interest_group_applications (applicant_id, name, description)
+        VALUES (%s, 'Morning Walkers', 'Walks around the park')
+        RETURNING id
+        """,
+        (applicant_id,),
+    ).fetchone()[0]
+
+
+@pytest.fixture
+def data():
+    # Users, two groups and pending applications, all named after one prefix
+    prefix = f"budget-test-{uuid.uuid4().hex[:12]}"
+    d = SimpleNamespace(prefix=prefix)
+    with psycopg.connect(DATABASE_URL) as conn:
+        d.admin = f"{prefix}-admin"
+        d.creator = f"{prefix}-creator"
+        d.member = f"{prefix}-member"
+        d.outsider = f"{prefix}-outsider"
+        _add_user(conn, d.admin, role="Admin")
+        d.creator_id = _add_user(conn, d.creator)
+        d.member_id = _add_user(conn, d.member)
+        d.outsider_id = _add_user(conn, d.outsider)
+        d.group_id = _add_group(conn, f"{prefix} Mahjong", d.creator_id, [d.member_id])
+        d.other_group_id = _add_group(conn, f"{prefix} Tai Chi", d.creator_id, [])
+        d.application_ids = [_add_application(conn, d.member_id) for _ in range(4)]
+    yield d
+
+    with psycopg.connect(DATABASE_URL) as conn:
+        users = "SELECT id FROM users WHERE clerk_user_id LIKE %s"
+        pattern = f"{prefix}%"
+        conn.execute(
+            f"DELETE FROM interest_group_applications WHERE applicant_id IN ({users})",
+            (pattern,),
+        )
+        conn.execute(
+            f"DELETE FROM group_memberships WHERE user_id IN ({users})", (pattern,)
+        )
+        conn.execute(
+            f"DELETE FROM group_memberships WHERE group_id IN (SELECT id FROM interest_groups WHERE creator_id IN ({users}))",
+            (pattern,),
+        )
+        conn.execute(
+            f"DELETE FROM interest_groups WHERE creator_id IN ({users})", (pattern,)
+        )
+        conn.execute("DELETE FROM users WHERE clerk_user_id LIKE %s", (pattern,))
+
+
+G = "/api/interest_groups"
+
+# (id, request builder, expected status). Each builder takes the data fixture
+# and returns (method, path, test client keyword arguments).
+CASES = [
+    (
+        "auth-new-user",
+        lambda d: (
+            "POST",
+            "/api/auth",
+            {"json": {"clerk_user_id": f"{d.prefix}-new", "name": "New", "phone": "1"}},
+        ),
+        201,
+    ),
+    (
+        "auth-existing-user",
+        lambda d: (
+            "POST",
+            "/api/auth",
+            {"json": {"clerk_user_id": d.member, "name": "Member", "phone": "1"}},
+        ),
+        200,
+    ),
+    (
+        "is-admin",
+        lambda d: ("POST", "/api/auth/isAdmin", {"json": {"clerk_user_id": d.admin}}),
+        200,
+    ),
+    (
+        "is-admin-batch",
+        lambda d: (
+            "POST",
+            "/api/auth/isAdmin/batch",
+            {"json": {"clerk_user_ids": [d.admin, d.member, f"{d.prefix}-nobody"]}},
+        ),
+        200,
+    ),
+    (
+        "bulk-onboard",
+        lambda d: (
+            "POST",
+            f"/api/auth/bulk?clerk_user_id={d.admin}",
+            {
+                "data": f"clerk_user_id,name,phone\n{d.prefix}-r1,Roster One,1\n{d.member},Member,1\n",
+                "content_type": "text/csv",
+            },
+        ),
+        200,
+    ),
+    ("all-groups", lambda d: ("GET", f"{G}/info/all", {}), 200),
+    (
+        "all-groups-for-viewer",
+        lambda d: ("GET", f"{G}/info/all?clerk_user_id={d.member}", {}),
+        200,
+    ),
+    ("search", lambda d: ("GET", f"{G}/search?q=mahjong", {}), 200),
+    (
+        # Nothing matches, so the fuzzy fallback runs too
+        "search-no-match",
+        lambda d: ("GET", f"{G}/search?q={uuid.uuid4().hex}", {}),
+        200,
+    ),
+    ("group-info", lambda d: ("GET", f"{G}/info/{d.group_id}", {}), 200),
+    ("user-groups", lambda d: ("GET", f"{G}/user/{d.member}", {}), 200),
+    (
+        "group-info-batch",
+        lambda d: (
+            "POST",
+            f"{G}/info/batch",
+            {"json": {"group_ids": [str(d.group_id), str(d.other_group_id), "x"]}},
+        ),
+        200,
+    ),
+    (
+        "join",
+        lambda d: (
+            "POST",
+            f"{G}/join/{d.group_id}",
+            {"json": {"clerk_user_id": d.outsider}},
+        ),
+        201,
+    ),
+    (
+        "leave",
+        lambda d: (
+            "POST",
+            f"{G}/leave/{d.group_id}",
+            {"json": {"clerk_user_id": d.member}},
+        ),
+        200,
+    ),
+    (
+        "join-batch",
+        lambda d: (
+            "POST",
+            f"{G}/join/batch",
+            {
+                "json": {
+                    "clerk_user_id": d.outsider,
+                    "group_ids": [str(d.group_id), str(d.other_group_id)],
+                }
+            },
+        ),
+        200,
+    ),
+    (
+        "leave-batch",
+        lambda d: (
+            "POST",
+            f"{G}/leave/batch",
+            {"json": {"clerk_user_id": d.member, "group_ids": [str(d.group_id)]}},
+        ),
+        200,
+    ),
+    (
+        "add-members",
+        lambda d: (
+            "POST",
+            f"{G}/members/{d.group_id}/add",
+            {"json": {"clerk_user_id": d.creator, "user_ids": [str(d.outsider_id)]}},
+        ),
+        200,
+    ),
+    (
+        "remove-members",
+        lambda d: (
+            "POST",
+            f"{G}/members/{d.group_id}/remove",
+            {"json": {"clerk_user_id": d.creator, "user_ids": [str(d.member_id)]}},
+        ),
+        200,
+    ),
+    ("members", lambda d: ("GET", f"{G}/members/{d.group_id}", {}), 200),
+    (
+        "members-stream",
+        lambda d: ("GET", f"{G}/members/{d.group_id}?stream=ndjson", {}),
+        200,
+    ),
+    (
+        "transfer-owner",
+        lambda d: (
+            "POST",
+            f"{G}/transfer_owner/{d.group_id}",
+            {
+                "json": {
+                    "clerk_user_id": d.creator,
+                    "transfer_user_uuid": str(d.member_id),
+                }
+            },
+        ),
+        200,
+    ),
+    ("creator", lambda d: ("GET", f"{G}/creator/{d.group_id}", {}), 200),
+    (
+        "edit",
+        lambda d: (
+            "PATCH",
+            f"{G}/edit/{d.group_id}",
+            {
+                "json": {
+                    "clerk_user_id": d.creator,
+                    "name": f"{d.prefix} Mahjong Society",
+                    "remove_member_id": str(d.member_id),
+                }
+            },
+        ),
+        200,
+    ),
+    (
+        "apply",
+        lambda d: (
+            "POST",
+            f"{G}/apply",
+            {
+                "json": {
+                    "clerk_user_id": d.member,
+                    "name": "Karaoke",
+                    "description": "Old favourites",
+                }
+            },
+        ),
+        201,
+    ),
+    ("applications", lambda d: ("GET", f"{G}/applications", {}), 200),
+    (
+        "application",
+        lambda d: ("GET", f"{G}/application/{d.application_ids[0]}", {}),
+        200,
+    ),
+    (
+        "approve",
+        lambda d: (
+            "POST",
+            f"{G}/application/{d.application_ids[0]}/approve",
+            {"json": {"clerk_user_id": d.admin}},
+        ),
+        200,
+    ),
+    (
+        "reject",
+        lambda d: (
+            "POST",
+            f"{G}/application/{d.application_ids[0]}/reject",
+            {"json": {"clerk_user_id": d.admin}},
+        ),
+        200,
+    ),
+    (
+        "approve-batch",
+        lambda d: (
+            "POST",
+            f"{G}/applications/approve",
+            {
+                "json": {
+                    "clerk_user_id": d.admin,
+                    "application_ids": [str(i) for i in d.application_ids],
+                }
+            },
+        ),
+        200,
+    ),
+    (
+        "reject-batch",
+        lambda d: (
+            "POST",
+            f"{G}/applications/reject",
+            {
+                "json": {
+                    "clerk_user_id": d.admin,
+                    "application_ids": [str(i) for i in d.application_ids],
+                }
+            },
+        ),
+        200,
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    "build, status", [case[1:] for case in CASES], ids=[case[0] for case in CASES]
+)
+def test_route_stays_within_budget(client, data, build, status):
+    method, path, kwargs = build(data)
+    response = client.open(path, method=method, **kwargs)
+    assert response.status_code == status, response.get_data(as_text=True)
+
+
+def _endpoint(app, method, path):
+    return app.url_map.bind("localhost").match(path.split("?")[0], method)[0]
+
+
+def test_every_api_route_declares_a_budget(app):
+    missing = [
+        rule.rule
+        for rule in app.url_map.iter_rules()
+        if rule.rule.startswith("/api/")
+        and not hasattr(app.view_functions[rule.endpoint], "query_budget")
+    ]
+    assert not missing
+
+
+def test_every_api_route_is_exercised(app):
+    # A new route needs a case in CASES
+    placeholder = SimpleNamespace(
+        prefix="p",
+        admin="a",
+        creator="c",
+        member="m",
+        outsider="o",
+        creator_id=uuid.uuid4(),
+        member_id=uuid.uuid4(),
+        outsider_id=uuid.uuid4(),
+        group_id=uuid.uuid4(),
+        other_group_id=uuid.uuid4(),
+        application_ids=[uuid.uuid4()],
+    )
+    exercised = set()
+    for _, build, _ in CASES:
+        method, path, _ = build(placeholder)
+        exercised.add(_endpoint(app, method, path))
+    routes = {
+        rule.endpoint
+        for rule in app.url_map.iter_rules()
+        if rule.rule.startswith("/api/")
+    }
+    assert routes - exercised == set()
+
+
+def test_over_budget_request_raises(app, client, monkeypatch):
+    path = f"{G}/applications"
+    view = app.view_functions[_endpoint(app, "GET", path)]
+    monkeypatch.setattr(view, "query_budget", 0)
+    with pytest.raises(QueryBudgetExceeded):
+        client.get(path)